@@ -23,6 +23,7 @@ base_settings = [
     'components/i18n.py',
     'components/media.py',
     'components/business.py',
+    'components/profiling.py',
     # Select the right env:
     'environments/{0}.py'.format(ENV),
     # Optionally override some settings:
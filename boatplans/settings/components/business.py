@@ -6,6 +6,18 @@ SITE_NAME = config('SITE_NAME', cast=str, default='Boatplans')
 MEASUREMENT_SYSTEM = config('MEASUREMENT_SYSTEM', cast=str, default='imperial')
 IS_METRIC_SYSTEM = (MEASUREMENT_SYSTEM == 'metric')
 
+# Number of recent designs per propulsion on the home page
+RECENT_DESIGNS_COUNT = config('RECENT_DESIGNS_COUNT', cast=int, default=4)
+
+# Number of precomputed similar designs of a design
+SIMILAR_DESIGNS_COUNT = config('SIMILAR_DESIGNS_COUNT', cast=int, default=8)
+
+# Similar designs near saved designs are updated in a background thread after
+# commit, set to False to update them in the saving process right after commit.
+SIMILAR_DESIGNS_IN_BACKGROUND = config(
+    'SIMILAR_DESIGNS_IN_BACKGROUND', cast=bool, default=True,
+)
+
 
 # Use old url-schema for designs
 LEGACY_URLS = config('LEGACY_URLS', cast=bool, default=False)
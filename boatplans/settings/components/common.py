@@ -19,6 +19,7 @@ INSTALLED_APPS = (
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     # 3rd party apps
     'corsheaders',
     'sorl.thumbnail',
@@ -26,11 +27,12 @@ INSTALLED_APPS = (
     'rest_framework',
     'django_filters',
     # local apps
-    'designs',
-    'news',
+    'designs.apps.DesignsConfig',
+    'news.apps.NewsConfig',
 )
 
 MIDDLEWARE = (
+    'designs.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -64,7 +66,7 @@ WSGI_APPLICATION = 'boatplans.wsgi.application'
 
 REST_FRAMEWORK = {
     'DEFAULT_RENDERER_CLASSES': (
-        'djangorestframework_camel_case.render.CamelCaseJSONRenderer',
+        'designs.api.renderers.CamelCaseJSONRenderer',
         'djangorestframework_camel_case.render.CamelCaseBrowsableAPIRenderer',
     ),
     'DEFAULT_PARSER_CLASSES': (
@@ -26,3 +26,6 @@ CACHES = {
         },
     },
 }
+
+# Rendered API responses are invalidated on changes, timeout just limits the cache size
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', cast=int, default=60 * 60 * 24)
@@ -21,3 +21,7 @@ COMPRESS_ENABLED = True
 
 THUMBNAIL_PRESERVE_FORMAT = True
 THUMBNAIL_QUALITY = 95
+
+# Thumbnails used by API are generated in background when images are saved,
+# set to 0 to disable pre-generation.
+THUMBNAIL_PREGENERATE_WORKERS = config('THUMBNAIL_PREGENERATE_WORKERS', cast=int, default=2)
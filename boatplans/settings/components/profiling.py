@@ -0,0 +1,26 @@
+"""Request profiling settings, see `designs.profiling`."""
+
+from boatplans.settings.components import config
+
+# Share of requests measured into histograms of `/metrics/`
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', cast=float, default=0.01)
+
+# Expose `/metrics/`, only behind a proxy adding X-Forwarded-For or X-Real-IP
+# headers, otherwise proxied requests look local
+PROFILING_METRICS_ENABLED = config('PROFILING_METRICS_ENABLED', cast=bool, default=False)
+
+# Addresses allowed to read `/metrics/` directly, requests through a proxy are refused
+PROFILING_METRICS_IPS = ('127.0.0.1', '::1')
+
+# Maximum of SQL queries per request by view class name, more queries are logged as
+# warnings. Queries of these views are counted on every request, other views are
+# measured only in sampled requests.
+# Counts of uncached responses of the API views are 2-11 queries
+QUERY_BUDGETS = {
+    'SiteInfoView': 5,
+    'RecentDesignsView': 5,
+    'DesignListView': 12,
+    'DesignDetailView': 15,
+    'SimilarDesignsView': 5,
+    'NewsListView': 5,
+}
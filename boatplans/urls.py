@@ -4,9 +4,13 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from designs.profiling import metrics_view
+
 urlpatterns = [
     path('api/', include('designs.api.urls')),
+    path('api/', include('news.api.urls')),
     path('admin/', admin.site.urls),
+    path('metrics/', metrics_view),
 ]
 
 if settings.DEBUG:
@@ -1,12 +1,16 @@
 """Admin for designs application."""
 
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.cache import cache
 from django.db import models
 from django.utils.html import format_html
 from django.utils.translation import ugettext as _
 from pagedown.widgets import AdminPagedownWidget
 from sorl.thumbnail.admin import AdminImageMixin
 
+from designs.api.cache import CACHE_KEY_PREFIX, CATALOGUE_SCOPE, get_versions
 from designs.models import (
     BoatKind,
     Design,
@@ -19,6 +23,36 @@ from designs.models import (
 )
 
 
+class CachedRelatedFieldListFilter(admin.RelatedFieldListFilter):
+    """Related filter with choices cached until the catalogue changes."""
+
+    def field_choices(self, field, request, model_admin):
+        cache_key = '{0}:admin-filter:{1}:{2}'.format(
+            CACHE_KEY_PREFIX,
+            field.related_model._meta.label_lower,
+            get_versions([CATALOGUE_SCOPE])[0],
+        )
+        choices = cache.get(cache_key)
+        if choices is None:
+            choices = super().field_choices(field, request, model_admin)
+            cache.set(cache_key, choices, settings.API_CACHE_TIMEOUT)
+        return choices
+
+
+class DesignChangeList(ChangeList):
+    """Changelist reading only columns shown in the list."""
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).only(
+            'name',
+            'slug',
+            'score',
+            'designer__name',
+            'designer__slug',
+            'propulsion__name',
+        )
+
+
 @admin.register(Propulsion)
 class PropulsionAdmin(admin.ModelAdmin):
     """Modeladmin for propulsion."""
@@ -66,7 +100,13 @@ class LinkInline(AdminImageMixin, admin.TabularInline):
 @admin.register(Design)
 class DesignAdmin(AdminImageMixin, admin.ModelAdmin):
     list_display = ('name', 'designer', 'propulsion', 'score', 'view_on_site')
-    list_filter = ('designer', 'propulsion')
+    list_select_related = ('designer', 'propulsion')
+    list_filter = (
+        ('designer', CachedRelatedFieldListFilter),
+        ('propulsion', CachedRelatedFieldListFilter),
+    )
+    # Filtered lists don't count all designs once more
+    show_full_result_count = False
     search_fields = ('name',)
     inlines = [ImageInline, VideoInline, LinkInline]
     prepopulated_fields = {'slug': ('name',)}
@@ -153,6 +193,9 @@ class DesignAdmin(AdminImageMixin, admin.ModelAdmin):
         ),
     )
 
+    def get_changelist(self, request, **kwargs):
+        return DesignChangeList
+
     def view_on_site(self, design):
         """Link to design's page."""
         return format_html('<a href="{0}">View</a>', design.get_absolute_url())
@@ -0,0 +1,206 @@
+"""Rendered responses cache for read-only designs API."""
+
+import hashlib
+import json
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+from django.utils.translation import get_language
+
+# Scope of responses depending on the whole catalogue (lists, site info)
+CATALOGUE_SCOPE = 'catalogue'
+
+# Scope of responses showing news
+NEWS_SCOPE = 'news'
+
+CACHE_KEY_PREFIX = 'api'
+
+
+def get_design_scope(slug):
+    """
+    Return scope of responses depending on the design.
+
+    >>> get_design_scope('tom-cat')
+    'design:tom-cat'
+    """
+    return 'design:{0}'.format(slug)
+
+
+def get_version_key(scope):
+    """
+    Return cache key of the scope version.
+
+    >>> get_version_key('catalogue')
+    'api:version:catalogue'
+    """
+    return '{0}:version:{1}'.format(CACHE_KEY_PREFIX, scope)
+
+
+def get_versions(scopes):
+    """
+    Return current versions of the scopes.
+
+    A version is a random token, so a version lost by cache eviction
+    can't match responses cached with an older version.
+    """
+    version_keys = [get_version_key(scope) for scope in scopes]
+    versions = cache.get_many(version_keys)
+    for version_key in version_keys:
+        if version_key not in versions:
+            cache.add(version_key, uuid.uuid4().hex, None)
+            versions[version_key] = cache.get(version_key)
+    return [versions[version_key] for version_key in version_keys]
+
+
+def invalidate(*scopes):
+    """Drop cached responses of the scopes by dropping their versions."""
+    cache.delete_many([get_version_key(scope) for scope in scopes])
+
+
+def get_normalized_params(query_params):
+    """
+    Return sorted non-empty query params.
+
+    >>> from django.http import QueryDict
+    >>> get_normalized_params(QueryDict('propulsion=sail&loa_max=&loa_min=4'))
+    [('loa_min', ['4']), ('propulsion', ['sail'])]
+    """
+    return sorted(
+        (param, sorted(param_values))
+        for param, param_values in query_params.lists()
+        if any(param_values)
+    )
+
+
+def get_stats_key(view_name, outcome):
+    """Return cache key of the hit/miss counter."""
+    return '{0}:stats:{1}:{2}'.format(CACHE_KEY_PREFIX, view_name, outcome)
+
+
+def count(view_name, outcome):
+    """Increment the hit/miss counter."""
+    stats_key = get_stats_key(view_name, outcome)
+    if not cache.add(stats_key, 1, None):
+        cache.incr(stats_key)
+
+
+def get_stats(view_names):
+    """Return `{view name: {'hit': N, 'miss': N}}`."""
+    outcomes = ('hit', 'miss')
+    counters = cache.get_many(
+        [
+            get_stats_key(view_name, outcome)
+            for view_name in view_names
+            for outcome in outcomes
+        ],
+    )
+    return {
+        view_name: {
+            outcome: counters.get(get_stats_key(view_name, outcome), 0) for outcome in outcomes
+        }
+        for view_name in view_names
+    }
+
+
+class CacheScopesMixin(object):
+    """Scopes of data shown by the view, see `invalidate`."""
+
+    cache_scopes = (CATALOGUE_SCOPE,)
+
+    def get_cache_scopes(self):
+        """Return scopes the response depends on."""
+        return self.cache_scopes
+
+
+class CachedResponseMixin(CacheScopesMixin):
+    """
+    Cache rendered responses of GET requests.
+
+    Responses are keyed by the path, normalized query params, language,
+    media type and versions of the view's scopes. Signal handlers in
+    `designs.signals` drop the versions when the shown data changes.
+    """
+
+    def get(self, request, *args, **kwargs):
+        """Return cached response or render a new one and cache it."""
+        view_name = type(self).__name__
+        cache_key = self.get_cache_key(request)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            count(view_name, 'hit')
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        count(view_name, 'miss')
+        response = self.get_uncached_response(request, *args, **kwargs)
+        response['X-Cache'] = 'MISS'
+        if response.status_code == 200:
+            response.add_post_render_callback(
+                lambda rendered: cache.set(
+                    cache_key,
+                    (rendered.content, rendered['Content-Type']),
+                    settings.API_CACHE_TIMEOUT,
+                ),
+            )
+        return response
+
+    def get_uncached_response(self, request, *args, **kwargs):
+        """Return a new response, views with own GET handler should override this one."""
+        return super().get(request, *args, **kwargs)
+
+    def get_cache_key(self, request):
+        """Return cache key of the response."""
+        key_data = json.dumps(
+            [
+                type(self).__name__,
+                request.get_host(),
+                request.path,
+                get_normalized_params(request.query_params),
+                get_language(),
+                request.accepted_media_type,
+                get_versions(self.get_cache_scopes()),
+            ],
+        )
+        return '{0}:response:{1}'.format(
+            CACHE_KEY_PREFIX,
+            hashlib.md5(key_data.encode()).hexdigest(),  # noqa: S303
+        )
+
+
+class ConditionalGetMixin(CacheScopesMixin):
+    """
+    Answer conditional GET requests with 304 before doing any serialization.
+
+    ETag is built from versions of the view's cache scopes (see
+    `CachedResponseMixin`), so it changes on any change invalidating the cached
+    response. No Last-Modified is sent: edits of images, tags or designers
+    don't touch any single timestamp, `If-Modified-Since` would get stale 304s.
+    """
+
+    def get(self, request, *args, **kwargs):
+        """Return 304 if client's ETag matches, add ETag to the response."""
+        etag = self.get_etag(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+        if response.status_code in {200, 304}:
+            response['ETag'] = etag
+        return response
+
+    def get_etag(self, request):
+        """Return ETag of the response."""
+        etag_data = json.dumps(
+            [
+                request.get_full_path(),
+                get_language(),
+                request.accepted_media_type,
+                get_versions(self.get_cache_scopes()),
+            ],
+        )
+        return quote_etag(hashlib.md5(etag_data.encode()).hexdigest())  # noqa: S303
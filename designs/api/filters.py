@@ -1,27 +1,98 @@
+from django.core.exceptions import ValidationError as FormValidationError
 from django_filters import rest_framework as filters
+from rest_framework.exceptions import ValidationError
 
-from designs.form_fields import clean_imperial_size_value
-from designs.models import Design, Propulsion
+from designs.form_fields import AreaFormField, SizeFormField, WeightFormField
+from designs.models import (
+    ENGINE_TYPES,
+    HULL_TYPES,
+    BoatKind,
+    Design,
+    HullConstruction,
+    Propulsion,
+    Tag,
+)
+
+
+class DimensionFilter(filters.CharFilter):
+    """Filter by a dimension with units, numbers without units are in `default_unit`."""
+
+    form_field_class = None
+    default_unit = ''
 
-class SizeFilter(filters.CharFilter):
     def filter(self, qs, value):
         if not value:
             return qs
-        if 'ft' in value:
-            value = clean_imperial_size_value(value)
+        dimension = value
+        try:
+            float(value.replace(',', '.'))
+        except ValueError:
+            pass
         else:
-            value = int(value) * 1000
+            dimension = '{0} {1}'.format(value, self.default_unit)
+        try:
+            dimension = self.form_field_class().clean(dimension)
+        except (FormValidationError, ValueError):
+            raise ValidationError({self.get_param_name(): 'Invalid value: {0}'.format(value)})
         lookup = '{field}__{expr}'.format(field=self.field_name, expr=self.lookup_expr)
-        return self.get_method(qs)(**{lookup: value})
+        return self.get_method(qs)(**{lookup: dimension})
+
+    def get_param_name(self):
+        """Return query parameter of the filter, e.g. `loa_min`."""
+        return next(
+            name for name, param_filter in self.parent.filters.items() if param_filter is self
+        )
+
+
+class SizeFilter(DimensionFilter):
+    form_field_class = SizeFormField
+    default_unit = 'm'
+
+
+class WeightFilter(DimensionFilter):
+    form_field_class = WeightFormField
+    default_unit = 'kg'
+
+
+class AreaFilter(DimensionFilter):
+    form_field_class = AreaFormField
+
+
+class RelatedFilter(filters.ModelMultipleChoiceFilter):
+    """Select designs related to any of the chosen objects without DISTINCT."""
+
+    def filter(self, qs, value):
+        if not value:
+            return qs
+        related_designs = Design.objects.filter(
+            **{'{0}__in'.format(self.field_name): value},
+        ).values('pk')
+        return qs.filter(pk__in=related_designs)
 
 
 class DesignFilterSet(filters.FilterSet):
     loa_min = SizeFilter(field_name='loa', lookup_expr='gte')
     loa_max = SizeFilter(field_name='loa', lookup_expr='lte')
+    beam_min = SizeFilter(field_name='beam', lookup_expr='gte')
+    beam_max = SizeFilter(field_name='beam', lookup_expr='lte')
+    draft_min = SizeFilter(field_name='draft', lookup_expr='gte')
+    draft_max = SizeFilter(field_name='draft', lookup_expr='lte')
+    weight_min = WeightFilter(field_name='weight', lookup_expr='gte')
+    weight_max = WeightFilter(field_name='weight', lookup_expr='lte')
+    sail_area_min = AreaFilter(field_name='sail_area', lookup_expr='gte')
+    sail_area_max = AreaFilter(field_name='sail_area', lookup_expr='lte')
     propulsion = filters.ModelChoiceFilter(
         queryset=Propulsion.objects.all(), to_field_name='slug', required=True
     )
+    # Facets, values of a facet are joined with OR, see `designs.facets`
+    hull_type = filters.MultipleChoiceFilter(choices=HULL_TYPES, distinct=False)
+    engine_type = filters.MultipleChoiceFilter(choices=ENGINE_TYPES, distinct=False)
+    hull_constructions = RelatedFilter(
+        queryset=HullConstruction.objects.all(), to_field_name='slug'
+    )
+    kinds = RelatedFilter(queryset=BoatKind.objects.all(), to_field_name='slug')
+    tags = RelatedFilter(queryset=Tag.objects.all(), to_field_name='slug')
 
     class Meta:
         model = Design
-        fields = ['propulsion']
\ No newline at end of file
+        fields = ['propulsion']
@@ -0,0 +1,124 @@
+"""Pagination for designs API."""
+
+import json
+
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class DesignCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the natural designs ordering `('loa', 'id')`.
+
+    DRF's `CursorPagination` filters by the first ordering field only and skips
+    rows with equal values by an offset, so pages get slower as duplicates grow.
+    Here the cursor holds values of all ordering fields and a page is selected by
+    a row comparison, which costs the same index range scan for any page.
+    Nullable fields are ordered with NULLs last on every database.
+    """
+
+    ordering = ('loa', 'id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Return a page of designs following (or preceding) the cursor position."""
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+        current_position = self.cursor.position if self.cursor else None
+
+        queryset = queryset.order_by(*self.get_order_by(reverse))
+        if current_position is not None:
+            queryset = queryset.filter(
+                self.get_position_filter(self.decode_position(current_position), reverse),
+            )
+
+        # Fetch an extra item to find out if there is a following page
+        results = list(queryset[: self.page_size + 1])
+        self.page = results[: self.page_size]
+        following_position = None
+        if len(results) > len(self.page):
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None
+            self.has_previous = following_position is not None
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = following_position is not None
+            self.has_previous = current_position is not None
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        self.display_page_controls = self.has_previous or self.has_next
+        return self.page
+
+    def get_order_by(self, reverse):
+        """Return ordering expressions, NULLs are the last ones."""
+        if reverse:
+            return [F(field_name).desc(nulls_first=True) for field_name in self.ordering]
+        return [F(field_name).asc(nulls_last=True) for field_name in self.ordering]
+
+    def get_position_filter(self, position, reverse):
+        """Return Q-object selecting rows following the position in the ordering."""
+        position_filter = Q(pk__in=[])
+        equal_filter = Q()
+        for field_name, field_value in zip(self.ordering, position):
+            following_filter = self.get_following_filter(field_name, field_value, reverse)
+            if following_filter is not None:
+                position_filter |= equal_filter & following_filter
+            if field_value is None:
+                equal_filter &= Q(**{'{0}__isnull'.format(field_name): True})
+            else:
+                equal_filter &= Q(**{field_name: field_value})
+        return position_filter
+
+    def get_following_filter(self, field_name, field_value, reverse):
+        """Return Q-object selecting values following the value, None if there are no such."""
+        if reverse:
+            if field_value is None:
+                return Q(**{'{0}__isnull'.format(field_name): False})
+            return Q(**{'{0}__lt'.format(field_name): field_value})
+
+        if field_value is None:
+            return None
+        return Q(**{'{0}__gt'.format(field_name): field_value}) | Q(
+            **{'{0}__isnull'.format(field_name): True},
+        )
+
+    def decode_position(self, position):
+        """Return values of ordering fields from the cursor position."""
+        try:
+            field_values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(field_values, list) or len(field_values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return field_values
+
+    def _get_position_from_instance(self, instance, ordering):
+        # Rows of values querysets (e.g. stored cards) are paginated as well
+        if isinstance(instance, dict):
+            field_values = [instance[field_name] for field_name in ordering]
+        else:
+            field_values = [getattr(instance, field_name) for field_name in ordering]
+        return json.dumps(
+            [
+                None if field_value is None else str(field_value)
+                for field_value in field_values
+            ],
+        )
+
+
+class DesignSearchPagination(PageNumberPagination):
+    """Numbered pages of search results, ranking can't be paginated by a keyset."""
+
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
@@ -0,0 +1,47 @@
+"""Renderers for designs API."""
+
+from djangorestframework_camel_case.util import camelize, camelize_re, underscore_to_camel
+from rest_framework.renderers import JSONRenderer
+
+
+class CamelCaseKeys(dict):
+    """
+    Map of snake_case keys to camelCase ones, unknown keys are converted once.
+
+    >>> keys = CamelCaseKeys()
+    >>> keys.add('tiny_description', 'loa')
+    >>> keys['tiny_description'], keys['sail_area'], keys['loa']
+    ('tinyDescription', 'sailArea', 'loa')
+    """
+
+    def __missing__(self, key):
+        camel_key = camelize_re.sub(underscore_to_camel, key) if '_' in key else key
+        self[key] = camel_key
+        return camel_key
+
+    def add(self, *keys):
+        """Convert the keys beforehand."""
+        for key in keys:
+            self[key]  # noqa: WPS428
+
+
+# Filled with `Meta.fields` of serializers on their definition,
+# see `designs.api.serializers.CamelCaseSerializerMixin`
+CAMEL_CASE_KEYS = CamelCaseKeys()
+
+
+class CamelCaseJSONRenderer(JSONRenderer):
+    """
+    Render data with camelCase keys as is.
+
+    `djangorestframework_camel_case` renderer rewrites every key of every response
+    with a regex in a second recursive pass. Serializers of designs API emit camelCase
+    keys themselves through `CAMEL_CASE_KEYS`, so only error details are converted.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render JSON, camelize keys of error responses."""
+        response = (renderer_context or {}).get('response')
+        if response is not None and response.exception:
+            data = camelize(data)
+        return super().render(data, accepted_media_type, renderer_context)
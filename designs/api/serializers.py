@@ -1,9 +1,12 @@
 """Serializers for design app."""
 
+from collections import OrderedDict
+
 from django.conf import settings
+from django.db import models
 from rest_framework import serializers
-from sorl.thumbnail import get_thumbnail
 
+from designs.api.renderers import CAMEL_CASE_KEYS
 from designs.formats import (
     humanize_imperial_area,
     humanize_imperial_size,
@@ -11,21 +14,55 @@ from designs.formats import (
     humanize_metric_size,
     humanize_size_range,
 )
-from designs.models import Design, Designer, Image, Propulsion
-from designs.selectors import get_length_interval_for_design, get_lengths_for_propulsion
+from designs.models import Design, Designer, Image, Link, Propulsion, Tag, Video
+from designs.profiling import measure
+from designs.selectors import get_length_interval_counts, get_length_interval_for_design
+from designs.thumbnails import get_thumbnail_key, get_thumbnails
+
+
+class CamelCaseSerializerMixin(object):
+    """Emit camelCase keys, so the renderer doesn't rewrite them in a second pass."""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        meta = getattr(cls, 'Meta', None)
+        CAMEL_CASE_KEYS.add(*getattr(meta, 'fields', ()))
+
+    @property
+    def data(self):
+        """Return representation, timed for the request profiler."""
+        with measure('serializer_ms'):
+            return super().data
+
+    def to_representation(self, instance):
+        """Return representation of the instance keyed by camelCase field names."""
+        return OrderedDict(
+            (CAMEL_CASE_KEYS[field_name], field_value)
+            for field_name, field_value in super().to_representation(instance).items()
+        )
+
+
+class CamelCaseModelSerializer(CamelCaseSerializerMixin, serializers.ModelSerializer):
+    """Model serializer emitting camelCase keys."""
 
 
 class SerializerThumbnailImageField(serializers.Field):
+    formats = (None, 'WEBP')
+
     def __init__(self, *args, **kwargs):
         self.size = kwargs.pop('size')
         super().__init__(*args, *kwargs)
 
     def to_representation(self, image):
-        double_size = (self.size[0] * 2, self.size[1] * 2)
-        default_image = self.get_thumbnail(image, self.size)
-        double_image = self.get_thumbnail(image, double_size)
-        webp_image = self.get_thumbnail(image, self.size, format='WEBP')
-        webp_double_image = self.get_thumbnail(image, double_size, format='WEBP')
+        specs = self.get_thumbnail_specs(image)
+        # Thumbnails can be resolved in bulk by `BulkThumbnailListSerializer`
+        thumbnails = self.context.get('thumbnails', {})
+        missing_specs = [spec for spec in specs if get_thumbnail_key(*spec) not in thumbnails]
+        if missing_specs:
+            thumbnails = {**thumbnails, **get_thumbnails(missing_specs)}
+        default_image, double_image, webp_image, webp_double_image = (
+            thumbnails[get_thumbnail_key(*spec)] for spec in specs
+        )
 
         return {
             'original': image.url,
@@ -41,14 +78,51 @@ class SerializerThumbnailImageField(serializers.Field):
             ],
         }
 
-    def get_thumbnail(self, image, size, format=None):
-        kwargs = {'format': format} if format else {}
-        return get_thumbnail(image, '{0}x{1}'.format(*size), **kwargs)
+    def get_thumbnail_specs(self, image):
+        """Return (image, geometry, format) triples required to represent the image."""
+        double_size = (self.size[0] * 2, self.size[1] * 2)
+        return [
+            (image, '{0}x{1}'.format(*size), image_format)
+            for image_format in self.formats
+            for size in (self.size, double_size)
+        ]
 
     def build_srcset(self, image, image_2x):
         return '{0}, {1} 2x'.format(image.url, image_2x.url)
 
 
+class BulkThumbnailListSerializer(serializers.ListSerializer):
+    """Resolve thumbnails of all items with a single KV store lookup."""
+
+    @property
+    def data(self):
+        """Return representation, timed for the request profiler."""
+        with measure('serializer_ms'):
+            return super().data
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        items = list(iterable)
+        self.context.setdefault('thumbnails', {}).update(
+            get_thumbnails(self.get_thumbnail_specs(items)),
+        )
+        return super().to_representation(items)
+
+    def get_thumbnail_specs(self, items):
+        thumbnail_fields = [
+            field
+            for field in self.child.fields.values()
+            if isinstance(field, SerializerThumbnailImageField)
+        ]
+        specs = []
+        for item in items:
+            for field in thumbnail_fields:
+                image = field.get_attribute(item)
+                if image:
+                    specs.extend(field.get_thumbnail_specs(image))
+        return specs
+
+
 class SerializerSizeField(serializers.Field):
     def to_representation(self, size):
         return {
@@ -65,7 +139,7 @@ class SerializerAreaField(serializers.Field):
         }
 
 
-class DesignerLightSerializer(serializers.ModelSerializer):
+class DesignerLightSerializer(CamelCaseModelSerializer):
     absolute_url = serializers.CharField(source='get_absolute_url')
 
     class Meta:
@@ -73,13 +147,13 @@ class DesignerLightSerializer(serializers.ModelSerializer):
         fields = ['slug', 'name', 'absolute_url']
 
 
-class PropulsionSerializer(serializers.ModelSerializer):
+class PropulsionSerializer(CamelCaseModelSerializer):
     class Meta:
         model = Propulsion
         fields = ['slug', 'long_name']
 
 
-class PropulsionWithLengthsSerializer(serializers.ModelSerializer):
+class PropulsionWithLengthsSerializer(CamelCaseModelSerializer):
     lengths = serializers.SerializerMethodField()
 
     class Meta:
@@ -89,32 +163,64 @@ class PropulsionWithLengthsSerializer(serializers.ModelSerializer):
     def get_lengths(self, propulsion):
         slug_format = '{0}-{1}' if settings.IS_METRIC_SYSTEM else '{0}ft-{1}ft'
         unit = 'м' if settings.IS_METRIC_SYSTEM else 'ft'
+        # Counts for all propulsions can be passed in context to avoid a query per propulsion
+        length_counts = self.context.get('length_counts')
+        if length_counts is None:
+            length_counts = get_length_interval_counts(propulsion=propulsion)
         return [
             {
                 'slug': slug_format.format(size_from, size_to),
                 'label': humanize_size_range(size_from, size_to, unit),
+                'count': count,
             }
-            for (size_from, size_to) in get_lengths_for_propulsion(propulsion)
+            for (size_from, size_to, count) in length_counts.get(propulsion.pk, [])
         ]
 
 
-class DesignDrawingSerializer(serializers.ModelSerializer):
+class DesignDrawingSerializer(CamelCaseModelSerializer):
     image = SerializerThumbnailImageField(size=(200, 200))
 
     class Meta:
         model = Image
+        list_serializer_class = BulkThumbnailListSerializer
         fields = ['image', 'title', 'image_url']
 
 
-class DesignPhotoSerializer(serializers.ModelSerializer):
+class DesignPhotoSerializer(CamelCaseModelSerializer):
     image = SerializerThumbnailImageField(size=(360, 360))
 
     class Meta:
         model = Image
+        list_serializer_class = BulkThumbnailListSerializer
         fields = ['image', 'title', 'image_url']
 
 
-class DesignCardSerializer(serializers.ModelSerializer):
+class TagSerializer(CamelCaseModelSerializer):
+    class Meta:
+        model = Tag
+        fields = ['slug', 'name']
+
+
+class VideoSerializer(CamelCaseModelSerializer):
+    image = SerializerThumbnailImageField(size=(200, 200))
+    video_url = serializers.CharField(source='get_video_url')
+
+    class Meta:
+        model = Video
+        list_serializer_class = BulkThumbnailListSerializer
+        fields = ['video_type', 'video_id', 'video_url', 'image', 'title', 'description']
+
+
+class LinkSerializer(CamelCaseModelSerializer):
+    image = SerializerThumbnailImageField(size=(120, 120))
+
+    class Meta:
+        model = Link
+        list_serializer_class = BulkThumbnailListSerializer
+        fields = ['link_type', 'url', 'image', 'title', 'description']
+
+
+class DesignCardSerializer(CamelCaseModelSerializer):
     absolute_url = serializers.CharField(source='get_absolute_url')
     image = SerializerThumbnailImageField(size=(120, 120))
     designer = DesignerLightSerializer()
@@ -122,6 +228,7 @@ class DesignCardSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Design
+        list_serializer_class = BulkThumbnailListSerializer
         fields = [
             'slug',
             'absolute_url',
@@ -133,7 +240,7 @@ class DesignCardSerializer(serializers.ModelSerializer):
         ]
 
 
-class DesignListSerializer(serializers.ModelSerializer):
+class DesignListSerializer(CamelCaseModelSerializer):
     absolute_url = serializers.CharField(source='get_absolute_url')
     image = SerializerThumbnailImageField(size=(64, 64))
     designer = DesignerLightSerializer()
@@ -144,6 +251,7 @@ class DesignListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Design
+        list_serializer_class = BulkThumbnailListSerializer
         fields = [
             'slug',
             'absolute_url',
@@ -158,13 +266,17 @@ class DesignListSerializer(serializers.ModelSerializer):
         ]
 
 
-class DesignDetailSerializer(serializers.ModelSerializer):
+class DesignDetailSerializer(CamelCaseModelSerializer):
     image = SerializerThumbnailImageField(size=(500, 500))
     propulsion = PropulsionSerializer()
     length_interval = serializers.SerializerMethodField()
     designer = DesignerLightSerializer()
     drawings = serializers.SerializerMethodField()
     photos = serializers.SerializerMethodField()
+    videos = VideoSerializer(many=True)
+    links = LinkSerializer(many=True)
+    tags = TagSerializer(many=True)
+    see_also = DesignCardSerializer(many=True)
 
     class Meta:
         model = Design
@@ -180,6 +292,10 @@ class DesignDetailSerializer(serializers.ModelSerializer):
             'description',
             'drawings',
             'photos',
+            'videos',
+            'links',
+            'tags',
+            'see_also',
         ]
 
     # FIXME Code duplication with PropulsionWithLengthsSerializer.get_lengths
@@ -192,6 +308,7 @@ class DesignDetailSerializer(serializers.ModelSerializer):
             'label': humanize_size_range(size_from, size_to, unit),
         }
 
+    # Images are prefetched once by `get_design_details` and split here
     def get_drawings(self, design):
         drawings = [image for image in design.images.all() if image.image_type == 'drawing']
         return DesignDrawingSerializer(drawings, many=True).data
@@ -199,3 +316,36 @@ class DesignDetailSerializer(serializers.ModelSerializer):
     def get_photos(self, design):
         photos = [image for image in design.images.all() if image.image_type == 'photo']
         return DesignPhotoSerializer(photos, many=True).data
+
+
+def iterate_subclasses(cls):
+    """Yield all subclasses of the class, not only direct ones, each once."""
+    seen = set()
+    subclasses = cls.__subclasses__()
+    while subclasses:
+        subclass = subclasses.pop()
+        if subclass not in seen:
+            seen.add(subclass)
+            subclasses.extend(subclass.__subclasses__())
+            yield subclass
+
+
+def get_declared_thumbnail_fields(model):
+    """Return `(attribute, field)` pairs for thumbnail fields of the model's serializers."""
+    return [
+        (field.source or field_name, field)
+        for serializer_class in iterate_subclasses(serializers.ModelSerializer)
+        if getattr(getattr(serializer_class, 'Meta', None), 'model', None) is model
+        for field_name, field in serializer_class._declared_fields.items()  # noqa: WPS437
+        if isinstance(field, SerializerThumbnailImageField)
+    ]
+
+
+def get_instance_thumbnail_specs(instance):
+    """Return specs of every thumbnail the API can render for the model instance."""
+    specs = []
+    for attribute, field in get_declared_thumbnail_fields(type(instance)):
+        image = getattr(instance, attribute)
+        if image:
+            specs.extend(field.get_thumbnail_specs(image))
+    return specs
@@ -0,0 +1,33 @@
+"""Streaming JSON responses for large design lists."""
+
+import itertools
+
+from rest_framework.utils.encoders import JSONEncoder
+
+from designs.cards import get_cards_data
+
+
+def stream_json_array(items):
+    """Yield JSON array of the items chunk by chunk."""
+    encoder = JSONEncoder(ensure_ascii=False)
+    yield '['
+    for index, item in enumerate(items):
+        if index:
+            yield ','
+        yield encoder.encode(item)
+    yield ']'
+
+
+def iterate_cards(card_rows, kind, chunk_size):
+    """
+    Yield cards data of the card rows.
+
+    Rows are fetched with a server-side cursor, missing cards are rendered
+    chunk by chunk, so memory doesn't depend on the number of designs.
+    """
+    rows = card_rows.iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield from get_cards_data(chunk, kind)
@@ -6,6 +6,10 @@ from designs.api import views
 urlpatterns = [
     path('site-info/', views.SiteInfoView.as_view()),
     path('designs/recent/', views.RecentDesignsView.as_view()),
+    path('designs/search/', views.DesignSearchView.as_view()),
+    path('designs/stream/', views.DesignStreamView.as_view()),
+    path('designs/export/<export_format>/', views.DesignExportView.as_view()),
     path('designs/', views.DesignListView.as_view()),
     path('designs/<designer>/<slug>/', views.DesignDetailView.as_view()),
+    path('designs/<designer>/<slug>/similar/', views.SimilarDesignsView.as_view()),
 ]
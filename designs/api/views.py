@@ -1,58 +1,174 @@
 """API views for designs app."""
 
+from collections import defaultdict
+
 from django.conf import settings
+from django.http import Http404, StreamingHttpResponse
 from rest_framework.generics import ListAPIView, RetrieveAPIView
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from designs.api.cache import (
+    CATALOGUE_SCOPE,
+    CachedResponseMixin,
+    ConditionalGetMixin,
+    get_design_scope,
+)
 from designs.api.filters import DesignFilterSet
+from designs.api.pagination import DesignCursorPagination, DesignSearchPagination
+from designs.api.renderers import CAMEL_CASE_KEYS
 from designs.api.serializers import (
-    DesignCardSerializer,
     DesignDetailSerializer,
     DesignListSerializer,
     PropulsionSerializer,
     PropulsionWithLengthsSerializer,
 )
+from designs.api.streaming import iterate_cards, stream_json_array
+from designs.cards import get_card_rows, get_cards_data
+from designs.export import EXPORT_FORMATS, stream_export
+from designs.facets import get_cached_facet_counts
 from designs.models import Design, Propulsion
-from designs.selectors import get_enabled_designs, get_recent_designs
+from designs.search import search_designs
+from designs.selectors import (
+    get_design_details,
+    get_enabled_designs,
+    get_length_interval_counts,
+    get_recent_designs,
+    get_similar_designs,
+)
 
 
-class SiteInfoView(APIView):
-    def get(self, *args, **kwargs):
+class SiteInfoView(ConditionalGetMixin, CachedResponseMixin, APIView):
+    def get_uncached_response(self, *args, **kwargs):
         propulsions = PropulsionWithLengthsSerializer(
             Propulsion.objects.all(),
             many=True,
+            context={'length_counts': get_length_interval_counts()},
         ).data
         return Response(
             {
-                'site_name': settings.SITE_NAME,
+                'siteName': settings.SITE_NAME,
                 'propulsions': propulsions,
             }
         )
 
 
-class RecentDesignsView(APIView):
-    def get(self, *args, **kwargs):
+class RecentDesignsView(ConditionalGetMixin, CachedResponseMixin, APIView):
+    def get_uncached_response(self, *args, **kwargs):
+        card_rows = list(get_card_rows(get_recent_designs(), 'card', 'propulsion_id'))
+        recent_cards = defaultdict(list)
+        for card_row, card_data in zip(card_rows, get_cards_data(card_rows, 'card')):
+            recent_cards[card_row['propulsion_id']].append(card_data)
         recent_designs = [
             {
                 'propulsion': PropulsionSerializer(propulsion).data,
-                'recent': DesignCardSerializer(
-                    get_recent_designs(propulsion),
-                    many=True,
-                ).data,
+                'recent': recent_cards[propulsion.pk],
             }
             for propulsion in Propulsion.objects.all()
         ]
         return Response(recent_designs)
 
 
-class DesignListView(ListAPIView):
+class CardListMixin(object):
+    """List designs with their stored cards instead of serializing them."""
+
+    card_kind = 'list'
+
+    def list(self, request, *args, **kwargs):
+        card_rows = self.paginate_queryset(
+            get_card_rows(self.filter_queryset(self.get_queryset()), self.card_kind),
+        )
+        return self.get_paginated_response(get_cards_data(card_rows, self.card_kind))
+
+
+class DesignListView(
+    ConditionalGetMixin, CachedResponseMixin, CardListMixin, ListAPIView,
+):
     queryset = get_enabled_designs()
     serializer_class = DesignListSerializer
     filterset_class = DesignFilterSet
+    pagination_class = DesignCursorPagination
 
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        facet_counts = get_cached_facet_counts(
+            self.filterset_class,
+            request.query_params,
+            self.get_queryset(),
+        )
+        response.data['facets'] = {
+            CAMEL_CASE_KEYS[facet]: counts for facet, counts in facet_counts.items()
+        }
+        return response
+
+
+class DesignStreamView(ConditionalGetMixin, ListAPIView):
+    """Unpaginated designs list streamed as JSON array, for exports and big clients."""
 
-class DesignDetailView(RetrieveAPIView):
-    lookup_field = 'slug'
     queryset = get_enabled_designs()
-    serializer_class = DesignDetailSerializer
\ No newline at end of file
+    filterset_class = DesignFilterSet
+    chunk_size = 500
+
+    def list(self, request, *args, **kwargs):
+        card_rows = get_card_rows(self.filter_queryset(self.get_queryset()), 'list')
+        return StreamingHttpResponse(
+            stream_json_array(
+                iterate_cards(card_rows, 'list', self.chunk_size),
+            ),
+            content_type='application/json',
+        )
+
+
+class DesignExportView(ConditionalGetMixin, ListAPIView):
+    """Enabled designs streamed in an export format for staff, see `designs.export`."""
+
+    queryset = get_enabled_designs()
+    # The whole catalogue with internal columns, e.g. `score`
+    permission_classes = [IsAdminUser]
+    chunk_size = 1000
+
+    def list(self, request, *args, **kwargs):
+        export_format = self.kwargs['export_format']
+        if export_format not in EXPORT_FORMATS:
+            raise Http404
+        _, content_type = EXPORT_FORMATS[export_format]
+        return StreamingHttpResponse(
+            stream_export(self.get_queryset(), export_format, self.chunk_size),
+            content_type=content_type,
+        )
+
+
+class DesignSearchView(
+    ConditionalGetMixin, CachedResponseMixin, CardListMixin, ListAPIView,
+):
+    serializer_class = DesignListSerializer
+    pagination_class = DesignSearchPagination
+
+    def get_queryset(self):
+        query_text = self.request.query_params.get('q', '').strip()
+        if not query_text:
+            return Design.objects.none()
+        return search_designs(get_enabled_designs(), query_text)
+
+
+class DesignDetailView(ConditionalGetMixin, CachedResponseMixin, RetrieveAPIView):
+    lookup_field = 'slug'
+    queryset = get_design_details()
+    serializer_class = DesignDetailSerializer
+
+    def get_cache_scopes(self):
+        return (get_design_scope(self.kwargs['slug']),)
+
+
+class SimilarDesignsView(ConditionalGetMixin, CachedResponseMixin, APIView):
+    """Cards of designs similar by dimensions, see `designs.similarity`."""
+
+    def get_cache_scopes(self):
+        return (get_design_scope(self.kwargs['slug']), CATALOGUE_SCOPE)
+
+    def get_uncached_response(self, request, *args, **kwargs):
+        if not get_enabled_designs(slug=self.kwargs['slug']).exists():
+            raise Http404
+        card_rows = get_card_rows(get_similar_designs(self.kwargs['slug']), 'card')
+        return Response(get_cards_data(card_rows, 'card'))
@@ -8,3 +8,7 @@ class DesignsConfig(AppConfig):
     """Config for designs application."""
 
     name = 'designs'
+
+    def ready(self):
+        """Connect signal handlers."""
+        import designs.signals  # noqa: F401, WPS433
@@ -0,0 +1,162 @@
+"""
+API benchmark helpers, see `benchmark_api` command.
+
+Endpoints are requested with the Django test client, every request is
+measured by `designs.profiling.profile`. Results of an endpoint are medians
+of its `uncached` requests, with scopes of cached responses invalidated
+before each request, and of its `cached` ones.
+"""
+
+import io
+import statistics
+import subprocess  # noqa: S404
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image as PilImage
+
+from designs.api.cache import CATALOGUE_SCOPE, get_design_scope, invalidate
+from designs.profiling import profile
+from designs.selectors import get_enabled_designs
+
+# Endpoint name: query string of the designs list
+LIST_QUERIES = (
+    ('list', 'propulsion=sail'),
+    ('list, length', 'propulsion=sail&loa_min=5&loa_max=8'),
+    ('list, hull types', 'propulsion=motor&hull_type=catamaran&hull_type=trimaran'),
+    ('list, dimensions', 'propulsion=sail&hull_type=mono&beam_max=2.5&weight_max=1500'),
+    ('list, oars', 'propulsion=oars&loa_max=6'),
+)
+
+# Results of an endpoint measured with and without cached responses
+MODES = ('uncached', 'cached')
+
+# Relative change of median latency reported as a regression by `--compare`
+REGRESSION_THRESHOLD = 0.2
+
+
+def get_commit():
+    """Return hash of the checked out commit, None outside of a git repository."""
+    try:
+        return subprocess.run(  # noqa: S603, S607
+            ('git', 'rev-parse', '--short', 'HEAD'),
+            cwd=str(settings.BASE_DIR),
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def get_stub_image():
+    """Return content of a small JPEG image."""
+    image_file = io.BytesIO()
+    PilImage.new('RGB', (800, 600), (40, 90, 160)).save(image_file, 'JPEG')
+    return ContentFile(image_file.getvalue())
+
+
+def summarize(samples):
+    """Return latency and median measurements of the samples."""
+    latencies = sorted(sample.measurements['latency_ms'] for sample in samples)
+    return {
+        'median_ms': round(statistics.median(latencies), 3),
+        'min_ms': round(latencies[0], 3),
+        'max_ms': round(latencies[-1], 3),
+        'queries': statistics.median(sample.measurements['sql_count'] for sample in samples),
+        'sql_ms': round(statistics.median(
+            sample.measurements['sql_ms'] for sample in samples
+        ), 3),
+        'thumbnail_lookups': statistics.median(
+            sample.measurements['thumbnail_lookups'] for sample in samples
+        ),
+    }
+
+
+def get_design_endpoints(details_count):
+    """Return detail and similar designs endpoints of the first synthetic designs."""
+    endpoints = {}
+    designs = get_enabled_designs(slug__startswith='synthetic-').order_by('pk')
+    for index, design in enumerate(designs[:details_count]):
+        scopes = (get_design_scope(design.slug), CATALOGUE_SCOPE)
+        design_url = '/api/designs/{0}/{1}/'.format(design.designer.slug, design.slug)
+        endpoints['detail {0}'.format(index)] = (design_url, scopes)
+        endpoints['similar {0}'.format(index)] = ('{0}similar/'.format(design_url), scopes)
+    return endpoints
+
+
+def get_endpoints(client, details_count):
+    """Return `{name: (url, scopes of its cached responses)}`."""
+    endpoints = {
+        'site-info': ('/api/site-info/', (CATALOGUE_SCOPE,)),
+        'recent': ('/api/designs/recent/', (CATALOGUE_SCOPE,)),
+    }
+    for name, query_string in LIST_QUERIES:
+        endpoints[name] = ('/api/designs/?{0}'.format(query_string), (CATALOGUE_SCOPE,))
+    endpoints.update(get_design_endpoints(details_count))
+    # Following page of the first list, its cursor is known after a request
+    next_url = client.get(endpoints['list'][0]).json().get('next')
+    if next_url:
+        endpoints['list, next page'] = (next_url, (CATALOGUE_SCOPE,))
+    return endpoints
+
+
+def profile_requests(client, url, repeat, scopes=()):
+    """Return samples of the repeated request, scopes are invalidated before each one."""
+    samples = []
+    for _attempt in range(repeat):
+        if scopes:
+            invalidate(*scopes)
+        with profile() as sample:
+            client.get(url)
+        samples.append(sample)
+    return samples
+
+
+def benchmark_endpoint(client, url, scopes, repeat):
+    """Return response size and measurements of the endpoint."""
+    # The first request renders design cards and generates thumbnails
+    response = client.get(url)
+    return {
+        'url': url,
+        'status': response.status_code,
+        'bytes': len(response.content),
+        'uncached': summarize(profile_requests(client, url, repeat, scopes)),
+        'cached': summarize(profile_requests(client, url, repeat)),
+    }
+
+
+def get_changes(baseline, report):
+    """Yield `(endpoint name, mode, baseline, current)` measurements of both reports."""
+    for name, endpoint in report['endpoints'].items():
+        baseline_endpoint = baseline['endpoints'].get(name)
+        if baseline_endpoint is not None:
+            yield from (
+                (name, mode, baseline_endpoint[mode], endpoint[mode]) for mode in MODES
+            )
+
+
+def get_latency_change(before, after):
+    """Return relative change of median latency."""
+    return after['median_ms'] / before['median_ms'] - 1
+
+
+def is_regression(before, after):
+    """Return True if the endpoint became slower beyond threshold or runs more queries."""
+    return (
+        get_latency_change(before, after) > REGRESSION_THRESHOLD
+        or after['queries'] > before['queries']
+    )
+
+
+def format_change(name, mode, before, after):
+    """Return line describing change of the endpoint measurements."""
+    return '{0}, {1}: {2:.2f} -> {3:.2f} ms ({4:+.0%}), {5} -> {6} queries'.format(
+        name,
+        mode,
+        before['median_ms'],
+        after['median_ms'],
+        get_latency_change(before, after),
+        before['queries'],
+        after['queries'],
+    )
@@ -0,0 +1,129 @@
+"""
+Pre-rendered design cards for API lists.
+
+List endpoints show the same designs over and over, so their serialized
+representations are stored in `DesignCard` table per language and measurement
+system. Cards of a design are dropped when the design, its designer or media
+are saved, missing cards are rendered and stored on the fly. Cards rendered
+with other thumbnail settings are not used, see `get_thumbnail_settings_version`.
+"""
+
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, FilteredRelation, Q
+from django.utils import translation
+
+from designs.api.cache import CATALOGUE_SCOPE, invalidate
+from designs.api.serializers import DesignCardSerializer, DesignListSerializer
+from designs.models import DesignCard
+from designs.selectors import get_enabled_designs
+from designs.thumbnails import get_thumbnail_settings_version
+
+CARD_SERIALIZERS = {
+    'card': DesignCardSerializer,
+    'list': DesignListSerializer,
+}
+
+
+def get_card_language():
+    """Return language of cards for the active language."""
+    return (translation.get_language() or settings.LANGUAGE_CODE).split('-')[0]
+
+
+def render_design_cards(design_ids, kind):
+    """Render and store cards of the designs in the active language, return `{pk: data}`."""
+    designs = get_enabled_designs(pk__in=design_ids)
+    serializer_class = CARD_SERIALIZERS[kind]
+    cards = {
+        design.pk: card_data
+        for design, card_data in zip(designs, serializer_class(designs, many=True).data)
+    }
+    language = get_card_language()
+    with transaction.atomic():
+        # Cards of other thumbnail settings are dropped as well
+        DesignCard.objects.filter(
+            design_id__in=design_ids,
+            kind=kind,
+            language=language,
+            measurement_system=settings.MEASUREMENT_SYSTEM,
+        ).delete()
+        DesignCard.objects.bulk_create(
+            [
+                DesignCard(
+                    design_id=design_id,
+                    kind=kind,
+                    language=language,
+                    measurement_system=settings.MEASUREMENT_SYSTEM,
+                    thumbnails_version=get_thumbnail_settings_version(),
+                    data=card_data,
+                )
+                for design_id, card_data in cards.items()
+            ],
+            ignore_conflicts=True,
+        )
+    return cards
+
+
+def refresh_design_cards(design_ids):
+    """Render cards of all kinds in all languages for the designs."""
+    design_ids = list(design_ids)
+    for language, _name in settings.LANGUAGES:
+        with translation.override(language):
+            for kind in CARD_SERIALIZERS:
+                render_design_cards(design_ids, kind)
+    # Responses could be cached with old cards while they were refreshed
+    invalidate(CATALOGUE_SCOPE)
+
+
+def delete_design_cards(designs):
+    """Delete stored cards of the designs queryset."""
+    DesignCard.objects.filter(design__in=designs).delete()
+    # Responses could be cached with old cards while they were stored
+    invalidate(CATALOGUE_SCOPE)
+
+
+def drop_design_cards(designs):
+    """Delete stored cards of the designs after commit, requests render them again."""
+    transaction.on_commit(partial(delete_design_cards, designs))
+
+
+def get_card_rows(designs, kind, *fields):
+    """Return values queryset of the designs with the fields and their stored cards."""
+    return designs.annotate(
+        card=FilteredRelation(
+            'cards',
+            condition=Q(
+                cards__kind=kind,
+                cards__language=get_card_language(),
+                cards__measurement_system=settings.MEASUREMENT_SYSTEM,
+                cards__thumbnails_version=get_thumbnail_settings_version(),
+            ),
+        ),
+    ).values('id', 'loa', *fields, card_data=F('card__data'))
+
+
+def get_cards_data(card_rows, kind):
+    """Return cards data of the rows, render missing ones."""
+    card_rows = list(card_rows)
+    missing_ids = [row['id'] for row in card_rows if row['card_data'] is None]
+    rendered = render_design_cards(missing_ids, kind) if missing_ids else {}
+    return [
+        rendered[row['id']] if row['card_data'] is None else row['card_data']
+        for row in card_rows
+    ]
+
+
+def get_cards_by_id(designs, kind):
+    """Return `{pk: cards data}` of the designs queryset."""
+    card_rows = list(get_card_rows(designs, kind))
+    return {
+        card_row['id']: card_data
+        for card_row, card_data in zip(card_rows, get_cards_data(card_rows, kind))
+    }
+
+
+def get_design_cards(designs, kind):
+    """Return cards data of the designs queryset without instantiating designs."""
+    return get_cards_data(get_card_rows(designs, kind), kind)
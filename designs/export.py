@@ -0,0 +1,163 @@
+"""
+Streaming export of the catalogue.
+
+Designs are read with a server-side cursor chunk by chunk, slugs of related
+tags, kinds and hull constructions are fetched with a query per relation and
+chunk, so memory doesn't depend on the number of designs. Dimensions are
+exported in stored units: millimeters, grams and square meters. Column names
+match the ones of `import_designs` command.
+
+Formats:
+
+* `jsonl` - a JSON object per design;
+* `csv` - a row per design, related slugs are comma separated;
+* `columns` - a JSON object per chunk of designs (a row group) with `columns`
+  of values and `packed` base64 encoded little-endian float64 arrays of
+  dimensions, missing dimensions are NaN. A row group is loaded with
+  `numpy.frombuffer(base64.b64decode(group['packed']['loa']), '<f8')`.
+"""
+
+import base64
+import csv
+import itertools
+
+import numpy as np
+from rest_framework.utils.encoders import JSONEncoder
+
+from designs.model_fields import AreaField, SizeField, WeightField
+from designs.models import Design
+
+# Stored dimensions in the order of model fields
+DIMENSION_FIELDS = tuple(
+    field.name
+    for field in Design._meta.fields
+    if isinstance(field, (SizeField, WeightField, AreaField))
+)
+
+# Column names with lookups of their values
+EXPORT_COLUMNS = (
+    ('slug', 'slug'),
+    ('name', 'name'),
+    ('designer', 'designer__slug'),
+    ('designer_name', 'designer__name'),
+    ('propulsion', 'propulsion__slug'),
+    ('hull_type', 'hull_type'),
+    ('engine_type', 'engine_type'),
+    *((name, name) for name in DIMENSION_FIELDS),
+    ('enabled', 'enabled'),
+    ('score', 'score'),
+    ('last_update', 'last_update'),
+)
+
+# Many-to-many fields exported as lists of slugs
+RELATED_FIELDS = ('tags', 'kinds', 'hull_constructions')
+
+PACKED_DTYPE = '<f8'
+
+
+def get_related_slugs(design_ids, name):
+    """Return `{design id: slugs}` of the many-to-many field of the designs."""
+    field = Design._meta.get_field(name)
+    through = field.remote_field.through
+    related_slugs = {design_id: [] for design_id in design_ids}
+    slug_rows = through.objects.filter(
+        **{'{0}__in'.format(field.m2m_column_name()): design_ids},
+    ).values_list(
+        field.m2m_column_name(),
+        '{0}__slug'.format(field.m2m_reverse_field_name()),
+    ).order_by(field.m2m_column_name(), 'pk')
+    for design_id, slug in slug_rows:
+        related_slugs[design_id].append(slug)
+    return related_slugs
+
+
+def iterate_export_chunks(designs, chunk_size):
+    """Yield lists of export rows of the designs, `chunk_size` rows at most."""
+    lookups = [lookup for _, lookup in EXPORT_COLUMNS]
+    columns = [column for column, _ in EXPORT_COLUMNS]
+    design_rows = designs.order_by('pk').values_list('pk', *lookups).iterator(
+        chunk_size=chunk_size,
+    )
+    while True:
+        chunk = list(itertools.islice(design_rows, chunk_size))
+        if not chunk:
+            return
+        design_ids = [design_row[0] for design_row in chunk]
+        related_slugs = {name: get_related_slugs(design_ids, name) for name in RELATED_FIELDS}
+        yield [
+            {
+                **dict(zip(columns, design_row[1:])),
+                **{name: related_slugs[name][design_row[0]] for name in RELATED_FIELDS},
+            }
+            for design_row in chunk
+        ]
+
+
+def stream_jsonl(chunks):
+    """Yield a JSON line per row."""
+    encoder = JSONEncoder(ensure_ascii=False)
+    for chunk in chunks:
+        yield ''.join('{0}\n'.format(encoder.encode(row)) for row in chunk)
+
+
+class EchoBuffer(object):
+    """File-like object returning written value, for streaming with `csv.writer`."""
+
+    def write(self, written):
+        """Return the written value."""
+        return written
+
+
+def stream_csv(chunks):
+    """Yield CSV header and a line per row."""
+    writer = csv.writer(EchoBuffer())
+    columns = [column for column, _ in EXPORT_COLUMNS] + list(RELATED_FIELDS)
+    yield writer.writerow(columns)
+    for chunk in chunks:
+        yield ''.join(
+            writer.writerow([
+                ','.join(row[column]) if column in RELATED_FIELDS else row[column]
+                for column in columns
+            ])
+            for row in chunk
+        )
+
+
+def pack_column(column_values):
+    """Return base64 encoded float64 array of the values, None is NaN."""
+    packed = np.array(
+        [np.nan if column_value is None else column_value for column_value in column_values],
+        dtype=PACKED_DTYPE,
+    )
+    return base64.b64encode(packed.tobytes()).decode('ascii')
+
+
+def stream_columns(chunks):
+    """Yield a JSON line per chunk of rows with dimensions packed as arrays."""
+    encoder = JSONEncoder(ensure_ascii=False)
+    for chunk in chunks:
+        columns = {column: [row[column] for row in chunk] for column in chunk[0]}
+        yield '{0}\n'.format(encoder.encode({
+            'rows': len(chunk),
+            'dtype': PACKED_DTYPE,
+            'columns': {
+                column: column_values
+                for column, column_values in columns.items()
+                if column not in DIMENSION_FIELDS
+            },
+            'packed': {name: pack_column(columns[name]) for name in DIMENSION_FIELDS},
+        }))
+
+
+# Format name: (stream function, content type)
+EXPORT_FORMATS = {
+    'jsonl': (stream_jsonl, 'application/x-ndjson'),
+    'csv': (stream_csv, 'text/csv'),
+    'columns': (stream_columns, 'application/x-ndjson'),
+}
+
+
+def stream_export(designs, export_format, chunk_size):
+    """Yield the designs exported in the format chunk by chunk."""
+    stream, _ = EXPORT_FORMATS[export_format]
+    return stream(iterate_export_chunks(designs, chunk_size))
@@ -0,0 +1,116 @@
+"""
+Facet counts of filtered designs.
+
+Counts of a facet are computed with all filters except the facet's own ones,
+so every value shows how many designs would be found if it was chosen too.
+Every facet is counted with one grouped query, so the number of queries
+doesn't depend on the number of facet values. Counts are cached per filter combination.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils.translation import get_language
+
+from designs.api.cache import (
+    CACHE_KEY_PREFIX,
+    CATALOGUE_SCOPE,
+    get_normalized_params,
+    get_versions,
+)
+from designs.models import ENGINE_TYPES, HULL_TYPES, BoatKind, Design, HullConstruction, Tag
+
+CHOICE_FACETS = {
+    'hull_type': HULL_TYPES,
+    'engine_type': ENGINE_TYPES,
+}
+
+RELATED_FACETS = {
+    'hull_constructions': HullConstruction,
+    'kinds': BoatKind,
+    'tags': Tag,
+}
+
+
+def get_facet_designs(filterset, facet):
+    """Return designs filtered with the validated filterset except the facet's filter."""
+    queryset = filterset.queryset
+    for name, value in filterset.form.cleaned_data.items():
+        if name != facet:
+            queryset = filterset.filters[name].filter(queryset, value)
+    return queryset.values('pk')
+
+
+def get_choice_facet_counts(filterset):
+    """Return `{facet: [{'value', 'name', 'count'}]}` of choice facets, a query per facet."""
+    facet_counts = {}
+    for facet, choices in CHOICE_FACETS.items():
+        counts = dict(
+            Design.objects.filter(
+                pk__in=get_facet_designs(filterset, facet),
+            ).values_list(facet).annotate(count=Count('pk')).order_by(),
+        )
+        facet_counts[facet] = [
+            {
+                'value': choice_value,
+                'name': str(choice_name),
+                'count': counts.get(choice_value, 0),
+            }
+            for choice_value, choice_name in choices
+        ]
+    return facet_counts
+
+
+def get_related_facet_counts(filterset):
+    """Return `{facet: [{'value', 'name', 'count'}]}` of related facets, a query per facet."""
+    return {
+        facet: [
+            {'value': related.slug, 'name': related.name, 'count': related.count}
+            for related in related_model.objects.annotate(
+                count=Count(
+                    'design',
+                    filter=Q(design__in=get_facet_designs(filterset, facet)),
+                ),
+            )
+        ]
+        for facet, related_model in RELATED_FACETS.items()
+    }
+
+
+def get_facet_counts(filterset):
+    """Return counts of all facets of the validated filterset."""
+    return {
+        **get_choice_facet_counts(filterset),
+        **get_related_facet_counts(filterset),
+    }
+
+
+def get_cached_facet_counts(filterset_class, query_params, queryset):
+    """Return counts of all facets, cached per filter combination and language."""
+    filter_params = query_params.copy()
+    for param in list(filter_params):
+        if param not in filterset_class.base_filters:
+            filter_params.pop(param)
+    key_data = json.dumps(
+        [
+            filterset_class.__name__,
+            get_normalized_params(filter_params),
+            get_language(),
+            get_versions((CATALOGUE_SCOPE,)),
+        ],
+    )
+    cache_key = '{0}:facets:{1}'.format(
+        CACHE_KEY_PREFIX,
+        hashlib.md5(key_data.encode()).hexdigest(),  # noqa: S303
+    )
+    facet_counts = cache.get(cache_key)
+    if facet_counts is None:
+        filterset = filterset_class(filter_params, queryset=queryset)
+        if not filterset.is_valid():
+            return {}
+        facet_counts = get_facet_counts(filterset)
+        cache.set(cache_key, facet_counts, settings.API_CACHE_TIMEOUT)
+    return facet_counts
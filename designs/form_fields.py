@@ -1,6 +1,8 @@
 """Form fields for handling dimensions."""
 
+import functools
 import re
+from decimal import Decimal
 
 from django import forms
 
@@ -9,6 +11,147 @@ INCHES_RE = re.compile(r'([0-9/]+)("|in)')
 
 MM_PER_FOOT = 304.8
 MM_PER_INCH = 25.4
+GRAMS_PER_POUND = 453.59237
+SQM_PER_SQFT = Decimal('0.092903')
+
+# Number of parsed strings cached per dimension, filters parse the same values over and over
+PARSED_CACHE_SIZE = 1024
+
+NUMBER = r'\d+(?:[.,]\d+)?'
+
+SIZE_RE = re.compile(
+    r"""
+    (?:
+        (?P<metric>{number})\s*(?P<metric_unit>mm|мм|cm|см|m|м)
+        |
+        (?:(?P<feet>{number})\s*(?:'|ft\.?|feet|foot))?\s*
+        (?:
+            (?:
+                (?:(?P<inches>\d+)(?:\s+|-))?
+                (?P<numerator>\d+)\s*/\s*(?P<denominator>[1-9]\d*)
+                |
+                (?P<whole_inches>{number})
+            )
+            \s*(?:"|''|in\.?|inch(?:es)?)
+        )?
+        |
+        (?P<millimeters>\d+)
+    )
+    """.format(number=NUMBER),
+    re.VERBOSE,
+)
+
+WEIGHT_RE = re.compile(
+    r'(?P<number>{number})\s*(?P<unit>kg|кг|t|т|lbs?\.?)?'.format(number=NUMBER),
+)
+
+AREA_RE = re.compile(
+    r'(?P<number>{number})\s*(?P<unit>sq\.?\s*ft\.?|sqf|sf|m2|m²|м2|м²)?'.format(
+        number=NUMBER,
+    ),
+)
+
+SIZE_FACTORS = {
+    'mm': 1,
+    'мм': 1,
+    'cm': 10,
+    'см': 10,
+    'm': 1000,
+    'м': 1000,
+}
+
+WEIGHT_FACTORS = {
+    None: 1,
+    'kg': 1000,
+    'кг': 1000,
+    't': 1000 * 1000,
+    'т': 1000 * 1000,
+    'lb': GRAMS_PER_POUND,
+    'lbs': GRAMS_PER_POUND,
+}
+
+
+def to_float(number):
+    """
+    Convert a number with decimal point or comma to float.
+
+    >>> to_float('1,5')
+    1.5
+    """
+    return float(number.replace(',', '.'))
+
+
+@functools.lru_cache(maxsize=PARSED_CACHE_SIZE)
+def parse_size(value):
+    """
+    Parse metric or imperial size string to millimeters (float), None if it isn't a size.
+
+    Imperial sizes are feet and inches with any fractions of inches.
+
+    >>> parse_size('1,23 m')
+    1230.0
+    >>> parse_size('1 ft 1/2 in')
+    317.5
+    >>> parse_size('5 ft 6 3/4 in'), parse_size('2 1/2"')
+    (1695.45, 63.5)
+    >>> parse_size('16ft')
+    4876.8
+    >>> parse_size('1500')
+    1500.0
+    >>> parse_size('1/0"'), parse_size(''), parse_size('big')
+    (None, None, None)
+    """
+    match = SIZE_RE.fullmatch(value.strip().lower())
+    if not match:
+        return None
+    if match['metric']:
+        return round(to_float(match['metric']) * SIZE_FACTORS[match['metric_unit']], 6)
+    if match['millimeters']:
+        return float(match['millimeters'])
+
+    if not (match['feet'] or match['whole_inches'] or match['numerator']):
+        return None
+    feet = to_float(match['feet']) if match['feet'] else 0
+    if match['numerator']:
+        fraction = int(match['numerator']) / int(match['denominator'])
+        inches = int(match['inches'] or 0) + fraction
+    else:
+        inches = to_float(match['whole_inches']) if match['whole_inches'] else 0
+    return round(MM_PER_FOOT * feet + MM_PER_INCH * inches, 6)
+
+
+@functools.lru_cache(maxsize=PARSED_CACHE_SIZE)
+def parse_weight(value):
+    """
+    Parse weight string to grams (float), numbers without units are grams.
+
+    >>> parse_weight('1,5kg'), parse_weight('100 lbs'), parse_weight('2 t'), parse_weight('5')
+    (1500.0, 45359.237, 2000000.0, 5.0)
+    >>> parse_weight('heavy')
+    """
+    match = WEIGHT_RE.fullmatch(value.strip().lower())
+    if not match:
+        return None
+    unit = match['unit'].rstrip('.') if match['unit'] else None
+    return to_float(match['number']) * WEIGHT_FACTORS[unit]
+
+
+@functools.lru_cache(maxsize=PARSED_CACHE_SIZE)
+def parse_area(value):
+    """
+    Parse area string to square meters (Decimal), numbers without units are square meters.
+
+    >>> parse_area('10'), parse_area('10 sq. ft.'), parse_area('12,5 m2')
+    (Decimal('10'), Decimal('0.929030'), Decimal('12.5'))
+    >>> parse_area('large')
+    """
+    match = AREA_RE.fullmatch(value.strip().lower())
+    if not match:
+        return None
+    area = Decimal(match['number'].replace(',', '.'))
+    if match['unit'] and match['unit'].startswith('s'):
+        return (area * SQM_PER_SQFT).quantize(Decimal('0.000001'))
+    return area
 
 
 def clean_unit_value(value, unit_factors):
@@ -91,17 +234,10 @@ class SizeFormField(forms.IntegerField):
         >>> field.clean('1 ft 1/2 in')
         318
         """
-        unit_factors = (
-            ('mm', 1),
-            ('мм', 1),
-            ('cm', 10),
-            ('см', 10),
-            ('m', 1000),
-            ('м', 1000),
-        )
-        size = clean_unit_value(size, unit_factors)
         if isinstance(size, str):
-            size = clean_imperial_size_value(size)
+            millimeters = parse_size(size)
+            if millimeters is not None:
+                size = int(round(millimeters))
         return super().clean(size)
 
 
@@ -121,16 +257,9 @@ class AreaFormField(forms.DecimalField):
         Decimal('0.929030')
         """
         if isinstance(area, str):
-            unit_factors = (
-                ('sq.ft', 0.092903),
-                ('sq.ft.', 0.092903),
-                ('sq ft', 0.092903),
-                ('sqf', 0.092903),
-                ('sf', 0.092903),
-            )
-            area = clean_unit_value(area, unit_factors)
-            if isinstance(area, float):
-                area = '{0:.6f}'.format(area)
+            square_meters = parse_area(area)
+            if square_meters is not None:
+                area = square_meters
         return super().clean(area)
 
 
@@ -148,17 +277,7 @@ class WeightFormField(forms.IntegerField):
         45359
         """
         if isinstance(weight, str):
-            unit_factors = (
-                ('kg', 1000),
-                ('кг', 1000),
-                ('t', 1000 * 1000),
-                ('т', 1000 * 1000),
-                ('lbs.', 453.59237),
-                ('lbs', 453.59237),
-                ('lb.', 453.59237),
-                ('lb', 453.59237),
-            )
-            weight = clean_unit_value(weight, unit_factors)
-            if isinstance(weight, float):
-                weight = int(round(weight))
+            grams = parse_weight(weight)
+            if grams is not None:
+                weight = int(round(grams))
         return super().clean(weight)
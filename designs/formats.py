@@ -1,6 +1,66 @@
-"""Formatting utils."""
+"""
+Formatting utils.
 
-from django.utils.translation import ugettext_lazy as _
+Translated templates are memoized per language and humanized values are cached
+by `(value, language)`, many designs share the same dimensions. Caches are
+dropped by `clear_format_caches` when translation catalogues are reloaded.
+"""
+
+import functools
+
+import numpy as np
+from django.utils.translation import get_language, ugettext
+from django.utils.translation import ugettext_noop as _  # noqa: WPS347
+
+# Max number of humanized values cached by every humanize function
+HUMANIZED_CACHE_SIZE = 4096
+
+MEMOIZED_FUNCTIONS = []
+
+
+def memoize(function):
+    """Register the cached function to be cleared by `clear_format_caches`."""
+    MEMOIZED_FUNCTIONS.append(function)
+    return function
+
+
+@memoize
+@functools.lru_cache(maxsize=None)
+def get_translated_template(template, language):
+    """Return translation of the template to the language, which should be the active one."""
+    return ugettext(template)
+
+
+def translate(template):
+    """
+    Return translation of the template to the active language.
+
+    >>> translate('{meters} m')
+    '{meters} m'
+    """
+    return get_translated_template(template, get_language())
+
+
+def memoize_per_language(function):
+    """Cache results of the one-argument function by the argument and active language."""
+    cached_function = memoize(
+        functools.lru_cache(maxsize=HUMANIZED_CACHE_SIZE)(
+            lambda argument, language: function(argument),
+        ),
+    )
+
+    @functools.wraps(function)
+    def wrapper(argument):  # noqa: WPS430
+        return cached_function(argument, get_language())
+
+    wrapper.cache_clear = cached_function.cache_clear
+    return wrapper
+
+
+def clear_format_caches():
+    """Drop memoized templates and humanized values, e.g. when translations are reloaded."""
+    for function in MEMOIZED_FUNCTIONS:
+        function.cache_clear()
 
 
 def humanize_size_range(size_from, size_to, unit='ft'):
@@ -20,16 +80,17 @@ def humanize_size_range(size_from, size_to, unit='ft'):
     size_to = int(size_to) if size_to else 0
 
     if size_to == 99:
-        return str(_('from {size_from} {unit}')).format(size_from=size_from, unit=unit)
+        return translate(_('from {size_from} {unit}')).format(size_from=size_from, unit=unit)
 
     if size_from == 0:
-        return str(_('up to {size_to} {unit}')).format(size_to=size_to, unit=unit)
+        return translate(_('up to {size_to} {unit}')).format(size_to=size_to, unit=unit)
 
-    return str(_('{size_from}-{size_to} {unit}')).format(
+    return translate(_('{size_from}-{size_to} {unit}')).format(
         size_from=size_from, size_to=size_to, unit=unit
     )
 
 
+@memoize_per_language
 def humanize_metric_size(size):
     """
     Convert size (millimeters) to human readable string in metric system.
@@ -44,9 +105,12 @@ def humanize_metric_size(size):
         return None
 
     meters = '{0:.2f}'.format(size / 1000.0).rstrip('0').rstrip('.')
-    return str(_('{meters} m')).format(meters=meters)
+    return translate(_('{meters} m')).format(meters=meters)
 
 
+# Not translated, so cached by the size only
+@memoize
+@functools.lru_cache(maxsize=HUMANIZED_CACHE_SIZE)
 def humanize_imperial_size(size):
     """
     Convert size (millimeters) to human readable string in imperial system.
@@ -80,6 +144,7 @@ def humanize_imperial_size(size):
     return size
 
 
+@memoize_per_language
 def humanize_metric_area(area):
     """
     Convert area (sq.meters) to human readable string in metric system.
@@ -93,9 +158,10 @@ def humanize_metric_area(area):
     if not area:
         return None
     sqm = '{0:.1f}'.format(area).rstrip('0').rstrip('.')
-    return str(_('{area} m²')).format(area=sqm)
+    return translate(_('{area} m²')).format(area=sqm)
 
 
+@memoize_per_language
 def humanize_imperial_area(area):
     """
     Convert area (sq.meters) to human readable string in imperial system.
@@ -107,4 +173,131 @@ def humanize_imperial_area(area):
     if not area:
         return None
     sqf = round(float(area) / 0.0929)
-    return str(_('{area} sq. ft.')).format(area=sqf)
\ No newline at end of file
+    return translate(_('{area} sq. ft.')).format(area=sqf)
+
+
+def fill_template(template, placeholder, values):
+    """
+    Put string array values into the template.
+
+    >>> fill_template('{meters} m', 'meters', np.array(['1', '2.5'])).tolist()
+    ['1 m', '2.5 m']
+    """
+    prefix, suffix = template.split('{{{0}}}'.format(placeholder))
+    return np.char.add(np.char.add(prefix, values), suffix)
+
+
+def strip_decimals(values):
+    """
+    Strip trailing zeros and decimal point of formatted numbers.
+
+    >>> strip_decimals(np.array(['1.50', '2.00', '10.0'])).tolist()
+    ['1.5', '2', '10']
+    """
+    return np.char.rstrip(np.char.rstrip(values, '0'), '.')
+
+
+def humanize_batch(values, humanize):
+    """
+    Humanize array of values, missing (None, NaN or zero) values become None.
+
+    Values are converted to floats, `humanize` takes an array without missing values
+    and returns an array of strings.
+    """
+    values = np.asarray(values, dtype=float)
+    missing = np.isnan(values) | (values == 0)
+    humanized = np.full(values.shape, None, dtype=object)
+    if not missing.all():
+        humanized[~missing] = humanize(values[~missing])
+    return humanized.tolist()
+
+
+def humanize_metric_sizes(sizes):
+    """
+    Convert array of sizes (millimeters) to human readable strings in metric system.
+
+    >>> humanize_metric_sizes([None, 1000, 1500])
+    [None, '1 m', '1.5 m']
+    >>> sizes = range(0, 30000, 7)
+    >>> humanize_metric_sizes(sizes) == [humanize_metric_size(size) for size in sizes]
+    True
+    """
+    template = translate(_('{meters} m'))
+    return humanize_batch(
+        sizes,
+        lambda known: fill_template(
+            template,
+            'meters',
+            strip_decimals(np.char.mod('%.2f', known / 1000)),
+        ),
+    )
+
+
+def format_feet_inches(sizes):
+    """Return array of feet and inches strings of sizes (millimeters)."""
+    total_inches = np.round(sizes / 25.4).astype(int)
+    feet, inches = np.divmod(total_inches, 12)
+
+    # Round inches for long boats
+    long_sizes = feet > 10
+    feet = feet + (long_sizes & (inches == 11))
+    inches = np.where(long_sizes & np.isin(inches, (1, 11)), 0, inches)
+
+    feet_strings = np.where(feet > 0, np.char.add(feet.astype(str), "'"), '')
+    inches_strings = np.where(inches > 0, np.char.add(inches.astype(str), '"'), '')
+    return np.char.strip(np.char.add(np.char.add(feet_strings, ' '), inches_strings))
+
+
+def humanize_imperial_sizes(sizes):
+    """
+    Convert array of sizes (millimeters) to human readable strings in imperial system.
+
+    >>> humanize_imperial_sizes([None, 25, 305, 330])
+    [None, '1"', "1'", '1\\' 1"']
+    >>> sizes = range(0, 30000, 7)
+    >>> humanize_imperial_sizes(sizes) == [humanize_imperial_size(size) for size in sizes]
+    True
+    """  # noqa: D301, WPS342
+    return humanize_batch(sizes, format_feet_inches)
+
+
+def humanize_metric_areas(areas):
+    """
+    Convert array of areas (sq.meters) to human readable strings in metric system.
+
+    >>> humanize_metric_areas([None, 11.5, 11.0])
+    [None, '11.5 m²', '11 m²']
+    >>> areas = [area / 10 for area in range(0, 2000, 3)]
+    >>> humanize_metric_areas(areas) == [humanize_metric_area(area) for area in areas]
+    True
+    """
+    template = translate(_('{area} m²'))
+    return humanize_batch(
+        areas,
+        lambda known: fill_template(
+            template,
+            'area',
+            strip_decimals(np.char.mod('%.1f', known)),
+        ),
+    )
+
+
+def humanize_imperial_areas(areas):
+    """
+    Convert array of areas (sq.meters) to human readable strings in imperial system.
+
+    >>> humanize_imperial_areas([None, 11.5])
+    [None, '124 sq. ft.']
+    >>> areas = [area / 10 for area in range(0, 2000, 3)]
+    >>> humanize_imperial_areas(areas) == [humanize_imperial_area(area) for area in areas]
+    True
+    """
+    template = translate(_('{area} sq. ft.'))
+    return humanize_batch(
+        areas,
+        lambda known: fill_template(
+            template,
+            'area',
+            np.round(known / 0.0929).astype(int).astype(str),
+        ),
+    )
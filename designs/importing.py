@@ -0,0 +1,215 @@
+"""
+Rows of designs import, see `import_designs` command.
+
+A row is a CSV row or a JSON line, values are cleaned with form fields of the
+models by `RowCleaner`. Empty CSV cells and missing JSON keys are left out of
+cleaned rows, so they keep current values, see `designs.upserts`. Boat kinds,
+hull constructions and propulsions must exist, designers and tags are created.
+"""
+
+import json
+
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
+from django.core.validators import validate_slug
+
+from designs.models import (
+    BoatKind,
+    Design,
+    Designer,
+    HullConstruction,
+    Image,
+    Link,
+    Propulsion,
+    Video,
+)
+
+# Design fields cleaned with form fields of the model, dimensions are parsed
+# by `SizeFormField`, `WeightFormField` and `AreaFormField`
+DESIGN_FIELDS = (
+    'name',
+    'tiny_description',
+    'url',
+    'meta_description',
+    'meta_keywords',
+    'hull_type',
+    'loa',
+    'lod',
+    'lwl',
+    'beam',
+    'bwl',
+    'draft',
+    'draft_cb_up',
+    'depth',
+    'freeboard',
+    'weight',
+    'ballast_weight',
+    'cb_weight',
+    'displacement',
+    'capacity',
+    'sail_area',
+    'sail_area_main',
+    'sail_area_jib',
+    'sail_area_genoa',
+    'sail_area_spi',
+    'accommodation',
+    'berths',
+    'headroom',
+    'horsepower',
+    'engine_type',
+    'description',
+    'price',
+    'kit_price',
+    'lang',
+    'enabled',
+    'score',
+)
+
+# Many-to-many fields given as lists of slugs
+RELATED_FIELDS = ('tags', 'kinds', 'hull_constructions')
+
+# Media lists of a design, items are matched with existing ones by `order`
+MEDIA_MODELS = {
+    'images': (Image, ('image_type', 'title', 'image_url', 'order')),
+    'videos': (Video, ('video_type', 'video_id', 'title', 'description', 'order')),
+    'links': (Link, ('link_type', 'url', 'title', 'description', 'order')),
+}
+
+
+def get_form_fields(model, field_names):
+    """Return `{name: form field}` of the model fields."""
+    return {name: model._meta.get_field(name).formfield() for name in field_names}
+
+
+def clean_values(form_fields, raw_values):
+    """Return cleaned values present in the raw ones."""
+    cleaned = {}
+    errors = {}
+    for name, form_field in form_fields.items():
+        if raw_values.get(name, '') == '':
+            continue
+        try:
+            cleaned[name] = form_field.clean(raw_values[name])
+        except ValidationError as error:
+            errors[name] = error.messages
+    if errors:
+        raise ValidationError(errors)
+    return cleaned
+
+
+def split_slugs(slugs):
+    """
+    Return list of slugs given as a list or a comma separated string.
+
+    >>> split_slugs('dinghy, plywood,')
+    ['dinghy', 'plywood']
+    """
+    if isinstance(slugs, str):
+        return [slug.strip() for slug in slugs.split(',') if slug.strip()]
+    return list(slugs)
+
+
+def load_list(items):
+    """Return list of dicts given as a list or a JSON string of CSV column."""
+    if isinstance(items, str):
+        items = json.loads(items)
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise ValueError('Not a list of objects')
+    return items
+
+
+def load_row(raw_row):
+    """Return dict of a CSV row or a JSON line."""
+    if isinstance(raw_row, dict):
+        return raw_row
+    try:
+        row = json.loads(raw_row)
+    except ValueError as error:
+        raise ValidationError({NON_FIELD_ERRORS: str(error)})
+    if not isinstance(row, dict):
+        raise ValidationError({NON_FIELD_ERRORS: 'Line is not a JSON object'})
+    return row
+
+
+class RowCleaner(object):
+    """Convert raw rows to python values with form fields of the models."""
+
+    def __init__(self):
+        """Prepare form fields and load objects referenced by slugs."""
+        self.key_fields = {
+            'slug': Design._meta.get_field('slug').formfield(),
+            'designer': Designer._meta.get_field('slug').formfield(),
+            'designer_name': Designer._meta.get_field('name').formfield(required=False),
+        }
+        self.design_fields = get_form_fields(Design, DESIGN_FIELDS)
+        self.media_fields = {
+            media: get_form_fields(model, field_names)
+            for media, (model, field_names) in MEDIA_MODELS.items()
+        }
+        self.propulsions = Propulsion.objects.in_bulk(field_name='slug')
+        self.related_objects = {
+            'kinds': BoatKind.objects.in_bulk(field_name='slug'),
+            'hull_constructions': HullConstruction.objects.in_bulk(field_name='slug'),
+        }
+
+    def clean(self, raw_row):
+        """Return row values converted to python ones, raise `ValidationError` if invalid."""
+        raw_row = load_row(raw_row)
+        row = {
+            **self.clean_keys(raw_row),
+            'fields': clean_values(self.design_fields, raw_row),
+        }
+        if raw_row.get('image'):
+            row['fields']['image'] = raw_row['image']
+        for name in RELATED_FIELDS:
+            row[name] = self.clean_slugs(name, raw_row.get(name))
+        for media in MEDIA_MODELS:
+            row[media] = self.clean_media(media, raw_row.get(media))
+        return row
+
+    def clean_keys(self, raw_row):
+        """Return slugs of the design and its designer, designer name and propulsion."""
+        keys = clean_values(self.key_fields, raw_row)
+        missing = {'slug', 'designer'} - set(keys)
+        if missing:
+            raise ValidationError(dict.fromkeys(missing, 'This field is required.'))
+        propulsion = self.propulsions.get(raw_row.get('propulsion'))
+        if propulsion is None:
+            raise ValidationError({'propulsion': 'Unknown propulsion'})
+        return {
+            'slug': keys['slug'],
+            'designer': keys['designer'],
+            'designer_name': keys.get('designer_name'),
+            'propulsion': propulsion,
+        }
+
+    def clean_slugs(self, name, slugs):
+        """Return list of related slugs, None if not given or empty."""
+        if slugs is None or slugs == '':
+            return None
+        slugs = split_slugs(slugs)
+        try:
+            for slug in slugs:
+                validate_slug(slug)
+        except ValidationError as error:
+            raise ValidationError({name: error.messages})
+        # Tags are created, other related objects must exist
+        unknown = set(slugs) - set(self.related_objects.get(name, slugs))
+        if unknown:
+            raise ValidationError({name: 'Unknown: {0}'.format(', '.join(sorted(unknown)))})
+        return slugs
+
+    def clean_media(self, media, items):
+        """Return list of cleaned media items, None if not given."""
+        if items is None or items == '':
+            return None
+        try:
+            items = load_list(items)
+        except ValueError as error:
+            raise ValidationError({media: str(error)})
+        cleaned_items = []
+        for index, item in enumerate(items):
+            cleaned = clean_values(self.media_fields[media], {'order': index, **item})
+            if item.get('image'):
+                cleaned['image'] = item['image']
+            cleaned_items.append(cleaned)
+        return cleaned_items
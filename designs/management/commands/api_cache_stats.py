@@ -0,0 +1,32 @@
+"""Show hit/miss counters of API responses cache."""
+
+from django.core.management.base import BaseCommand
+
+from designs.api import views
+from designs.api.cache import CachedResponseMixin, get_stats
+
+
+class Command(BaseCommand):
+    """Print hit/miss counters of cached API views."""
+
+    help = 'Show hit/miss counters of API responses cache.'
+
+    def handle(self, *args, **options):
+        """Print counters view by view."""
+        view_names = [
+            view_name
+            for view_name, view_class in vars(views).items()
+            if isinstance(view_class, type) and issubclass(view_class, CachedResponseMixin)
+            and view_class is not CachedResponseMixin
+        ]
+        for view_name, counters in get_stats(view_names).items():
+            requests_count = counters['hit'] + counters['miss']
+            hit_ratio = counters['hit'] / requests_count if requests_count else 0
+            self.stdout.write(
+                '{0}: {1} hits, {2} misses, {3:.0%} hit ratio'.format(
+                    view_name,
+                    counters['hit'],
+                    counters['miss'],
+                    hit_ratio,
+                ),
+            )
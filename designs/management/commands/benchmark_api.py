@@ -0,0 +1,146 @@
+"""Time API endpoints on a synthetic catalogue."""
+
+import json
+import tempfile
+import time
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import override_settings
+
+from designs.benchmarking import (
+    benchmark_endpoint,
+    format_change,
+    get_changes,
+    get_commit,
+    get_endpoints,
+    get_stub_image,
+    is_regression,
+)
+from designs.similarity import update_similar_designs
+from designs.synthetic import generate_catalogue
+
+# Settings making the benchmark independent of external services
+BENCHMARK_SETTINGS = {
+    'CACHES': {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    },
+    'ALLOWED_HOSTS': ('testserver',),
+    'THUMBNAIL_PREGENERATE_WORKERS': 0,
+    'SIMILAR_DESIGNS_IN_BACKGROUND': False,
+    # The benchmark measures requests itself
+    'PROFILING_SAMPLE_RATE': 0,
+    'QUERY_BUDGETS': {},
+}
+
+
+class Command(BaseCommand):
+    """
+    Benchmark API endpoints on a synthetic catalogue.
+
+    The catalogue is generated in a transaction which is rolled back at the
+    end, so the database is left untouched. Cache is replaced by the local
+    memory one and images by a stub in a temporary media root, thumbnails
+    are generated there, so nothing but the configured database is used.
+
+    Every endpoint is requested with scopes of its cached responses
+    invalidated before each request (`uncached`) and with the rendered
+    response cached (`cached`). Results are written as JSON, `--compare`
+    prints changes against results of an earlier run.
+    """
+
+    help = 'Time API endpoints and count their queries on a synthetic catalogue.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument('--designs', type=int, default=10000)
+        parser.add_argument('--designers', type=int, default=100)
+        parser.add_argument('--images', type=int, default=4, help='Images per design.')
+        parser.add_argument('--details', type=int, default=5, help='Designs to request.')
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', default='-', help='JSON file path, "-" for stdout.')
+        parser.add_argument('--compare', help='JSON file of an earlier run.')
+
+    def handle(self, *args, **options):
+        """Generate catalogue, run benchmarks and roll everything back."""
+        self.repeat = options['repeat']
+        with tempfile.TemporaryDirectory() as media_root:
+            with override_settings(MEDIA_ROOT=media_root, **BENCHMARK_SETTINGS):
+                with transaction.atomic():
+                    self.generate(options)
+                    endpoints = self.run_benchmarks(options['details'])
+                    transaction.set_rollback(True)
+
+        report = self.get_report(options, endpoints)
+        if options['compare']:
+            with open(options['compare']) as baseline_file:
+                self.compare(json.load(baseline_file), report)
+        self.write_report(report, options['output'])
+
+    def generate(self, options):
+        """Create the catalogue, its stub image and similar designs."""
+        started_at = time.perf_counter()
+        default_storage.save('synthetic/boat.jpg', get_stub_image())
+        generate_catalogue(
+            options['designs'],
+            designers_count=options['designers'],
+            images_per_design=options['images'],
+            seed=options['seed'],
+        )
+        update_similar_designs(rebuild=True)
+        self.stderr.write('Catalogue generated in {0:.1f} s'.format(
+            time.perf_counter() - started_at,
+        ))
+
+    def run_benchmarks(self, details_count):
+        """Return measurements of every endpoint."""
+        client = Client()
+        endpoints = {}
+        for name, (url, scopes) in get_endpoints(client, details_count).items():
+            endpoints[name] = benchmark_endpoint(client, url, scopes, self.repeat)
+            self.stderr.write('{0}: {1:.2f} ms, {2} queries; cached {3:.2f} ms'.format(
+                name,
+                endpoints[name]['uncached']['median_ms'],
+                endpoints[name]['uncached']['queries'],
+                endpoints[name]['cached']['median_ms'],
+            ))
+        return endpoints
+
+    def get_report(self, options, endpoints):
+        """Return results of the run with its commit, database and catalogue."""
+        return {
+            'commit': get_commit(),
+            'database': connection.vendor,
+            'catalogue': {
+                'designs': options['designs'],
+                'designers': options['designers'],
+                'images_per_design': options['images'],
+                'seed': options['seed'],
+            },
+            'repeat': self.repeat,
+            'endpoints': endpoints,
+        }
+
+    def write_report(self, report, output):
+        """Write the report as JSON to the file or to stdout if it is "-"."""
+        if output == '-':
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+        with open(output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+
+    def compare(self, baseline, report):
+        """Print changes of median latencies and query counts against the baseline."""
+        if baseline['catalogue'] != report['catalogue']:
+            self.stderr.write(self.style.WARNING('Baseline catalogue differs: {0}'.format(
+                baseline['catalogue'],
+            )))
+        self.stderr.write('=== against {0} ==='.format(baseline.get('commit')))
+        for name, mode, before, after in get_changes(baseline, report):
+            line = format_change(name, mode, before, after)
+            if is_regression(before, after):
+                line = self.style.ERROR(line)
+            self.stderr.write(line)
@@ -0,0 +1,85 @@
+"""Compare dimension parsers of form fields with the unit-by-unit ones."""
+
+import timeit
+
+from django.core.management.base import BaseCommand
+
+from designs.form_fields import (
+    clean_imperial_size_value,
+    clean_unit_value,
+    parse_size,
+    parse_weight,
+)
+
+SIZE_UNIT_FACTORS = (
+    ('mm', 1),
+    ('мм', 1),
+    ('cm', 10),
+    ('см', 10),
+    ('m', 1000),
+    ('м', 1000),
+)
+
+WEIGHT_UNIT_FACTORS = (
+    ('kg', 1000),
+    ('кг', 1000),
+    ('t', 1000 * 1000),
+    ('т', 1000 * 1000),
+    ('lbs.', 453.59237),
+    ('lbs', 453.59237),
+    ('lb.', 453.59237),
+    ('lb', 453.59237),
+)
+
+SIZES = ('1,23 m', '450 mm', '16 ft', "5' 6\"", '1 ft 1/2 in', '20ft 3in', '4500')
+
+WEIGHTS = ('1,5kg', '100 lbs', '2 t', '350 kg', '1200')
+
+
+def parse_size_by_units(size):
+    """Parse size as `SizeFormField` did before the single-pass parser."""
+    size = clean_unit_value(size, SIZE_UNIT_FACTORS)
+    if isinstance(size, str):
+        return clean_imperial_size_value(size)
+    return size
+
+
+def parse_weight_by_units(weight):
+    """Parse weight as `WeightFormField` did before the single-pass parser."""
+    return clean_unit_value(weight, WEIGHT_UNIT_FACTORS)
+
+
+class Command(BaseCommand):
+    """Time parsing of typical size and weight strings."""
+
+    help = 'Compare dimension parsers of form fields with the unit-by-unit ones.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument('--number', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        """Print microseconds per parse."""
+        benchmarks = (
+            ('sizes', SIZES, (
+                ('unit by unit', parse_size_by_units),
+                ('single pass', parse_size.__wrapped__),
+                ('single pass, cached', parse_size),
+            )),
+            ('weights', WEIGHTS, (
+                ('unit by unit', parse_weight_by_units),
+                ('single pass', parse_weight.__wrapped__),
+                ('single pass, cached', parse_weight),
+            )),
+        )
+        for title, values_to_parse, parsers in benchmarks:
+            self.stdout.write('=== {0} ==='.format(title))
+            for name, parse in parsers:
+                elapsed = timeit.timeit(
+                    lambda: [parse(value) for value in values_to_parse],  # noqa: WPS430
+                    number=options['number'],
+                )
+                self.stdout.write('{0}: {1:.2f} us'.format(
+                    name,
+                    elapsed / options['number'] / len(values_to_parse) * 1000000,
+                ))
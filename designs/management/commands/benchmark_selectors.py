@@ -0,0 +1,96 @@
+"""Compare design selectors with and without the Design indexes."""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from designs.models import Design, Propulsion
+from designs.selectors import (
+    get_designs_by_length,
+    get_length_interval_count_rows,
+    get_recent_designs,
+)
+from designs.synthetic import generate_catalogue
+
+
+class Command(BaseCommand):
+    """
+    Benchmark selectors on a synthetic catalogue.
+
+    Everything is done in a transaction which is rolled back at the end,
+    so the database is left untouched. Indexes declared in `Design.Meta.indexes`
+    are dropped for the "before" run and created again for the "after" run.
+    """
+
+    help = 'Compare query plans and latencies of design selectors with and without indexes.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument('--designs', type=int, default=100000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        """Generate catalogue, run benchmarks and roll everything back."""
+        self.repeat = options['repeat']
+        # SQLite schema editor can't be used inside a transaction otherwise
+        connection.disable_constraint_checking()
+        try:
+            self.run_in_transaction(options['designs'])
+        finally:
+            connection.enable_constraint_checking()
+
+    def run_in_transaction(self, designs_count):
+        """Run benchmarks in a transaction which is rolled back."""
+        with transaction.atomic():
+            generate_catalogue(designs_count)
+            self.analyze()
+
+            with connection.schema_editor() as schema_editor:
+                existing_indexes = connection.introspection.get_constraints(
+                    connection.cursor(),
+                    Design._meta.db_table,
+                )
+                for index in Design._meta.indexes:
+                    if index.name in existing_indexes:
+                        schema_editor.remove_index(Design, index)
+            self.analyze()
+            self.run_benchmarks('before')
+
+            with connection.schema_editor() as schema_editor:
+                for index in Design._meta.indexes:
+                    schema_editor.add_index(Design, index)
+            self.analyze()
+            self.run_benchmarks('after')
+
+            transaction.set_rollback(True)
+
+    def get_querysets(self):
+        """Return querysets of the selectors to benchmark."""
+        propulsion = Propulsion.objects.get(slug='sail')
+        return {
+            'length interval counts': get_length_interval_count_rows(),
+            'designs by length': get_designs_by_length(14, 18, propulsion=propulsion)[:50],
+            'recent designs': get_recent_designs(),
+        }
+
+    def run_benchmarks(self, title):
+        """Print query plans and median latencies."""
+        self.stdout.write('=== {0} ==='.format(title))
+        for name, queryset in self.get_querysets().items():
+            timings = []
+            for _attempt in range(self.repeat):
+                started_at = time.perf_counter()
+                list(queryset.all())
+                timings.append(time.perf_counter() - started_at)
+            self.stdout.write(
+                '{0}: {1:.2f} ms'.format(name, statistics.median(timings) * 1000),
+            )
+            self.stdout.write(queryset.explain())
+
+    def analyze(self):
+        """Update planner statistics."""
+        with connection.cursor() as cursor:
+            table_name = connection.ops.quote_name(Design._meta.db_table)
+            cursor.execute('ANALYZE {0}'.format(table_name))
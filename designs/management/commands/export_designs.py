@@ -0,0 +1,55 @@
+"""Export the catalogue to a file."""
+
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from designs.export import EXPORT_FORMATS, iterate_export_chunks
+from designs.models import Design
+
+
+class Command(BaseCommand):
+    """
+    Stream all designs to a file in JSON lines, CSV or columnar format.
+
+    Rows are read with a server-side cursor, so memory doesn't depend on the
+    size of the catalogue. JSON lines and CSV files can be loaded back with
+    `import_designs`.
+    """
+
+    help = 'Export the catalogue to a file.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument('path', help='Output file, - for stdout')
+        parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='jsonl')
+        parser.add_argument('--chunk-size', type=int, default=2000)
+        parser.add_argument('--enabled', action='store_true', help='Enabled designs only')
+
+    def handle(self, *args, **options):
+        """Write exported designs chunk by chunk."""
+        designs = Design.objects.all()
+        if options['enabled']:
+            designs = designs.filter(enabled=True)
+        self.designs_count = 0
+        started_at = time.monotonic()
+        stream, _ = EXPORT_FORMATS[options['format']]
+        chunks = self.count_designs(iterate_export_chunks(designs, options['chunk_size']))
+        lines = stream(chunks)
+        if options['path'] == '-':
+            sys.stdout.writelines(lines)
+        else:
+            with open(options['path'], 'w', newline='') as export_file:
+                export_file.writelines(lines)
+        elapsed = max(time.monotonic() - started_at, 1e-6)
+        self.stderr.write('{0} designs exported, {1:.1f} designs/sec'.format(
+            self.designs_count,
+            self.designs_count / elapsed,
+        ))
+
+    def count_designs(self, chunks):
+        """Pass the chunks through counting exported designs."""
+        for chunk in chunks:
+            self.designs_count += len(chunk)
+            yield chunk
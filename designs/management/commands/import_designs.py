@@ -0,0 +1,106 @@
+"""Import designs from a CSV or JSON lines file."""
+
+import csv
+import os
+import time
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from designs.api.cache import CATALOGUE_SCOPE, invalidate
+from designs.importing import RowCleaner
+from designs.similarity import update_similar_designs
+from designs.upserts import save_rows
+
+FORMATS = ('csv', 'jsonl')
+
+
+def get_file_format(options):
+    """Return format of the imported file given by option or guessed by extension."""
+    file_format = options['format'] or os.path.splitext(options['path'])[1].lstrip('.')
+    if file_format not in FORMATS:
+        raise CommandError('Unknown format, use --format {0}'.format('/'.join(FORMATS)))
+    return file_format
+
+
+def read_rows(import_file, file_format):
+    """Yield `(line number, raw row)` of the file, JSON lines are parsed by `RowCleaner`."""
+    if file_format == 'csv':
+        reader = csv.DictReader(import_file)
+        for raw_row in reader:
+            yield reader.line_num, raw_row
+        return
+    for line_number, line in enumerate(import_file, 1):
+        if line.strip():
+            yield line_number, line
+
+
+class Command(BaseCommand):
+    """
+    Upsert designs with their designers, relations and media in batches.
+
+    Rows are cleaned by `designs.importing` and saved by `designs.upserts`,
+    similar designs of changed designs are updated at the end. Thumbnails are
+    left to `warm_thumbnails`.
+    """
+
+    help = 'Import designs from a CSV or JSON lines file.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument('path')
+        parser.add_argument('--format', choices=FORMATS, help='Guessed by file extension')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        """Read the file row by row, import valid rows batch by batch."""
+        file_format = get_file_format(options)
+        cleaner = RowCleaner()
+        self.rows_count = 0
+        self.skipped_count = 0
+        self.started_at = time.monotonic()
+        changed_ids = set()
+        with open(options['path'], newline='') as import_file:
+            rows = read_rows(import_file, file_format)
+            for batch in self.clean_batches(rows, cleaner, options['batch_size']):
+                changed_ids.update(save_rows(batch, cleaner.related_objects))
+                self.rows_count += len(batch)
+                self.report()
+        # Kinds of a design can change without updating the design
+        update_similar_designs(changed_ids)
+        invalidate(CATALOGUE_SCOPE)
+
+    def clean_batches(self, rows, cleaner, batch_size):
+        """Yield lists of cleaned rows, invalid rows are reported and skipped."""
+        batch = {}
+        for line_number, raw_row in rows:
+            try:
+                row = cleaner.clean(raw_row)
+            except (ValidationError, ValueError) as error:
+                self.skip_row(line_number, error)
+                continue
+            # The last row of a slug wins
+            batch[row['slug']] = row
+            if len(batch) >= batch_size:
+                yield list(batch.values())
+                batch = {}
+        if batch:
+            yield list(batch.values())
+
+    def skip_row(self, line_number, error):
+        """Report the invalid row."""
+        self.skipped_count += 1
+        # Row validation errors are keyed by column
+        messages = error.message_dict if isinstance(error, ValidationError) else error
+        self.stderr.write('Line {0} skipped: {1}'.format(line_number, messages))
+
+    def report(self):
+        """Print progress and throughput."""
+        elapsed = max(time.monotonic() - self.started_at, 1e-6)
+        self.stdout.write(
+            '{0} rows imported, {1} skipped, {2:.1f} rows/sec'.format(
+                self.rows_count,
+                self.skipped_count,
+                self.rows_count / elapsed,
+            ),
+        )
@@ -0,0 +1,30 @@
+"""Render stored API cards of designs."""
+
+from django.core.management.base import BaseCommand
+
+from designs.cards import refresh_design_cards
+from designs.selectors import get_enabled_designs
+
+
+class Command(BaseCommand):
+    """
+    Render cards of all enabled designs.
+
+    Cards are dropped on save and rendered again on request, this one is
+    for the initial fill, after changing thumbnail settings and for changes
+    done with bulk updates bypassing signals.
+    """
+
+    help = 'Render stored API cards of enabled designs.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        """Refresh cards batch by batch."""
+        design_ids = list(get_enabled_designs().order_by('pk').values_list('pk', flat=True))
+        batch_size = options['batch_size']
+        for offset in range(0, len(design_ids), batch_size):
+            refresh_design_cards(design_ids[offset:offset + batch_size])
+        self.stdout.write('{0} designs refreshed'.format(len(design_ids)))
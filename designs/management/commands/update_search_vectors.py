@@ -0,0 +1,29 @@
+"""Store search vectors of designs."""
+
+from django.core.management.base import BaseCommand
+
+from designs.models import Design
+from designs.search import update_search_vectors
+
+
+class Command(BaseCommand):
+    """
+    Update search vectors of all designs.
+
+    Vectors are updated on save, this one is for the initial fill and
+    for changes done with bulk updates bypassing signals.
+    """
+
+    help = 'Update full-text search vectors of designs.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        """Update vectors batch by batch."""
+        design_ids = list(Design.objects.order_by('pk').values_list('pk', flat=True))
+        batch_size = options['batch_size']
+        for offset in range(0, len(design_ids), batch_size):
+            update_search_vectors(design_ids[offset:offset + batch_size])
+        self.stdout.write('{0} designs updated'.format(len(design_ids)))
@@ -0,0 +1,27 @@
+"""Store similar designs of all designs."""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from designs.similarity import update_similar_designs
+
+
+class Command(BaseCommand):
+    """
+    Compute nearest designs of all enabled designs.
+
+    Similar designs are updated on save, this one is for the initial fill,
+    for changes of `SIMILAR_DESIGNS_COUNT` and for bulk updates bypassing signals.
+    """
+
+    help = 'Store similar designs of all designs.'
+
+    def handle(self, *args, **options):
+        """Rebuild the similarity index and store nearest designs."""
+        started_at = time.monotonic()
+        design_ids = update_similar_designs(rebuild=True)
+        self.stdout.write('{0} designs updated in {1:.2f} sec'.format(
+            len(design_ids),
+            time.monotonic() - started_at,
+        ))
@@ -0,0 +1,118 @@
+"""Generate thumbnails used by API for all existing images."""
+
+import json
+import multiprocessing
+import os
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connections
+from sorl.thumbnail import ImageField
+
+from designs.api.serializers import get_instance_thumbnail_specs
+from designs.thumbnails import (
+    generate_thumbnails,
+    get_missing_thumbnail_specs,
+    get_thumbnail_key,
+)
+
+
+class Command(BaseCommand):
+    """
+    Warm thumbnails of the whole media tree in a process pool.
+
+    Thumbnails already present in KV store are skipped, so the command can be
+    re-run after changing `THUMBNAIL_QUALITY` or adding sizes to serializers.
+    With `--checkpoint` progress is saved after every round and an interrupted
+    run continues from the last processed object.
+    """
+
+    help = 'Generate thumbnails used by API for all existing images.'
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument('--workers', type=int, default=os.cpu_count())
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--checkpoint', help='JSON file to resume the progress from')
+
+    def handle(self, *args, **options):
+        """Warm thumbnails model by model, round by round."""
+        self.checkpoint_path = options['checkpoint']
+        self.checkpoint = self.load_checkpoint()
+        self.thumbnails_count = 0
+        self.generated_count = 0
+        self.started_at = time.monotonic()
+
+        # Forked workers must not share connections with the parent process
+        connections.close_all()
+        with multiprocessing.Pool(processes=options['workers']) as pool:
+            for model in self.get_image_models():
+                self.warm_model(model, pool, options['workers'], options['batch_size'])
+
+        self.report()
+
+    def get_image_models(self):
+        """Return models having image fields."""
+        return [
+            model
+            for model in apps.get_models()
+            if any(isinstance(field, ImageField) for field in model._meta.get_fields())
+        ]
+
+    def warm_model(self, model, pool, workers, batch_size):
+        """Generate missing thumbnails of model instances round by round."""
+        label = model._meta.label_lower
+        queryset = model.objects.filter(pk__gt=self.checkpoint.get(label, 0)).order_by('pk')
+        instances = []
+        for instance in queryset.iterator():
+            instances.append(instance)
+            if len(instances) >= workers * batch_size:
+                self.run_round(pool, instances, label, batch_size)
+                instances = []
+        if instances:
+            self.run_round(pool, instances, label, batch_size)
+        self.stdout.write('{0}: done'.format(label))
+
+    def run_round(self, pool, instances, label, batch_size):
+        """Generate thumbnails of the instances in parallel and save the progress."""
+        specs = {
+            get_thumbnail_key(*spec): spec
+            for instance in instances
+            for spec in get_instance_thumbnail_specs(instance)
+        }
+        # Thumbnails of the whole round are checked with a single KV store multi-get
+        missing_specs = get_missing_thumbnail_specs(specs.values())
+        pool.map(generate_thumbnails, [
+            missing_specs[start:start + batch_size]
+            for start in range(0, len(missing_specs), batch_size)
+        ])
+        self.thumbnails_count += len(specs)
+        self.generated_count += len(missing_specs)
+        self.checkpoint[label] = instances[-1].pk
+        self.save_checkpoint()
+        self.report()
+
+    def report(self):
+        """Print progress and throughput."""
+        elapsed = max(time.monotonic() - self.started_at, 1e-6)
+        self.stdout.write(
+            '{0} thumbnails checked, {1} generated, {2:.1f} thumbnails/sec'.format(
+                self.thumbnails_count,
+                self.generated_count,
+                self.thumbnails_count / elapsed,
+            ),
+        )
+
+    def load_checkpoint(self):
+        """Return `{model label: last processed pk}`."""
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return {}
+        with open(self.checkpoint_path) as checkpoint_file:
+            return json.load(checkpoint_file)
+
+    def save_checkpoint(self):
+        """Save progress to the checkpoint file."""
+        if self.checkpoint_path:
+            with open(self.checkpoint_path, 'w') as checkpoint_file:
+                json.dump(self.checkpoint, checkpoint_file)
@@ -1,6 +1,8 @@
 """Models for designs application."""
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
 from sorl.thumbnail import ImageField
@@ -237,10 +239,37 @@ class Design(models.Model):
     score = models.IntegerField(_('score'), default=0)
     last_update = models.DateTimeField(null=True, auto_now=True)
 
+    # Maintained by `designs.search.update_search_vectors`
+    search_vector = SearchVectorField(null=True, editable=False)
+
     class Meta(object):
         verbose_name = _('design')
         verbose_name_plural = _('designs')
         ordering = ('loa', 'id')
+        # Public pages select enabled designs of a propulsion,
+        # see `designs.selectors.get_enabled_designs`
+        indexes = (
+            models.Index(
+                fields=('propulsion', 'loa', 'id'),
+                condition=models.Q(enabled=True),
+                name='design_enabled_prop_loa_idx',
+            ),
+            models.Index(
+                fields=('propulsion', '-id'),
+                condition=models.Q(enabled=True),
+                name='design_enabled_prop_recent_idx',
+            ),
+            # Full-text and misspelled names search, see `designs.search`.
+            # `gin_trgm_ops` needs pg_trgm extension, `makemigrations` doesn't create it:
+            # run `CREATE EXTENSION IF NOT EXISTS pg_trgm;` as a superuser before `migrate`
+            # or add `TrigramExtension()` operation before the index in the migration.
+            GinIndex(fields=('search_vector',), name='design_search_vector_idx'),
+            GinIndex(
+                fields=('name',),
+                opclasses=('gin_trgm_ops',),
+                name='design_name_trgm_idx',
+            ),
+        )
 
     def __str__(self):
         return self.name
@@ -337,3 +366,38 @@ class Link(models.Model):
         verbose_name = _('design link')
         verbose_name_plural = _('design links')
         ordering = ('order', 'id')
+
+
+class DesignCard(models.Model):
+    """Pre-rendered design representation for API lists, see `designs.cards`."""
+
+    design = models.ForeignKey(Design, related_name='cards', on_delete=models.CASCADE)
+    kind = models.CharField(max_length=10)
+    language = models.CharField(max_length=2)
+    measurement_system = models.CharField(max_length=10)
+    # Thumbnail names in the data depend on thumbnail settings
+    thumbnails_version = models.CharField(max_length=8, default='')
+    data = models.JSONField()  # noqa: WPS110
+
+    class Meta(object):
+        verbose_name = _('design card')
+        verbose_name_plural = _('design cards')
+        unique_together = (
+            'design', 'kind', 'language', 'measurement_system', 'thumbnails_version',
+        )
+
+
+class SimilarDesign(models.Model):
+    """Precomputed design similar by dimensions, see `designs.similarity`."""
+
+    design = models.ForeignKey(
+        Design, related_name='similar_designs', on_delete=models.CASCADE,
+    )
+    similar = models.ForeignKey(Design, related_name='similar_to', on_delete=models.CASCADE)
+    rank = models.PositiveSmallIntegerField()
+    distance = models.FloatField()
+
+    class Meta(object):
+        verbose_name = _('similar design')
+        verbose_name_plural = _('similar designs')
+        unique_together = ('design', 'rank')
@@ -0,0 +1,259 @@
+"""
+Sampling request profiler.
+
+A share of requests (`PROFILING_SAMPLE_RATE`) is measured: latency, number
+and time of SQL queries, thumbnail KV store lookups and serializers time.
+Measurements are aggregated per URL route into histograms of the process and
+exposed in Prometheus text format by `metrics_view` to local clients only
+if `PROFILING_METRICS_ENABLED` is set.
+
+Queries of views listed in `QUERY_BUDGETS` are counted on every request of
+the view, a warning is logged when a view runs more queries than its budget.
+Other requests are measured only when sampled. Queries run while a streaming
+response is consumed are not counted.
+"""
+
+import bisect
+import contextlib
+import contextvars
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse
+
+logger = logging.getLogger(__name__)
+
+MILLISECONDS_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200)
+
+# Metric name: (help, histogram buckets)
+METRICS = {
+    'latency_ms': ('Request latency, ms', MILLISECONDS_BUCKETS),
+    'sql_count': ('SQL queries per request', COUNT_BUCKETS),
+    'sql_ms': ('SQL time per request, ms', MILLISECONDS_BUCKETS),
+    'thumbnail_lookups': ('Thumbnail KV store lookups per request', COUNT_BUCKETS),
+    'serializer_ms': ('Serializers time per request, ms', MILLISECONDS_BUCKETS),
+}
+
+METRIC_PREFIX = 'boatplans'
+
+# Measurements of the current request, None if it is not profiled
+current_sample = contextvars.ContextVar('current_sample', default=None)
+
+
+class Histogram(object):
+    """
+    Counts of observed values per bucket, the last bucket is unbounded.
+
+    >>> histogram = Histogram((1, 10))
+    >>> for observed in (0.5, 3, 30):
+    ...     histogram.observe(observed)
+    >>> histogram.get_cumulative_counts()
+    [('1', 1), ('10', 2), ('+Inf', 3)]
+    """
+
+    def __init__(self, buckets):
+        """Create an empty histogram."""
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0
+
+    def observe(self, observed):
+        """Count the value."""
+        self.counts[bisect.bisect_left(self.buckets, observed)] += 1
+        self.total += observed
+
+    def get_cumulative_counts(self):
+        """Return `(upper bound, number of values not above it)` pairs."""
+        bounds = [str(bucket) for bucket in self.buckets] + ['+Inf']
+        cumulative_counts = []
+        running_count = 0
+        for bound, bucket_count in zip(bounds, self.counts):
+            running_count += bucket_count
+            cumulative_counts.append((bound, running_count))
+        return cumulative_counts
+
+
+class Sample(object):
+    """Measurements of a request."""
+
+    def __init__(self):
+        """Start with zero measurements."""
+        self.measurements = dict.fromkeys(METRICS, 0)
+        # Metrics timed by `measure` at the moment, nested blocks are not added twice
+        self.timed_metrics = set()
+
+    def add(self, metric, measured):
+        """Add the measured value to the metric."""
+        self.measurements[metric] += measured
+
+    def execute(self, execute, sql, params, many, context):
+        """Count and time the query, see `connection.execute_wrapper`."""
+        started_at = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.add('sql_ms', (time.perf_counter() - started_at) * 1000)
+            self.add('sql_count', 1)
+
+
+def record(metric, measured=1):
+    """Add the measured value to the metric of the current request if it is profiled."""
+    sample = current_sample.get()
+    if sample is not None:
+        sample.add(metric, measured)
+
+
+@contextlib.contextmanager
+def measure(metric):
+    """Add time of the block in ms to the metric of the current request, once if nested."""
+    sample = current_sample.get()
+    if sample is None or metric in sample.timed_metrics:
+        yield
+        return
+    sample.timed_metrics.add(metric)
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        sample.timed_metrics.discard(metric)
+        sample.add(metric, (time.perf_counter() - started_at) * 1000)
+
+
+@contextlib.contextmanager
+def profile():
+    """Measure the block on all database connections, yield its `Sample`."""
+    sample = Sample()
+    token = current_sample.set(sample)
+    started_at = time.perf_counter()
+    try:
+        with contextlib.ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(sample.execute))
+            yield sample
+    finally:
+        current_sample.reset(token)
+        sample.add('latency_ms', (time.perf_counter() - started_at) * 1000)
+
+
+histograms = defaultdict(lambda: {
+    metric: Histogram(buckets) for metric, (_, buckets) in METRICS.items()
+})
+budget_exceeded_counts = defaultdict(int)
+histograms_lock = threading.Lock()
+
+
+def observe(endpoint, sample):
+    """Add measurements of the request to histograms of the endpoint."""
+    with histograms_lock:
+        endpoint_histograms = histograms[endpoint]
+        for metric, measured in sample.measurements.items():
+            endpoint_histograms[metric].observe(measured)
+
+
+def get_view_name(view_func):
+    """Return class or function name of the view."""
+    return getattr(view_func, 'view_class', view_func).__name__
+
+
+def get_endpoint(request):
+    """Return route of the resolved view, e.g. `api/designs/<designer>/<slug>/`."""
+    resolver_match = getattr(request, 'resolver_match', None)
+    if resolver_match is None:
+        return 'unresolved'
+    return resolver_match.route
+
+
+class ProfilingMiddleware(object):
+    """Profile sampled requests and requests of views with query budgets."""
+
+    def __init__(self, get_response):
+        """Keep the next handler."""
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Measure the sampled request, see `process_view` for views with a budget."""
+        sampled = random.random() < settings.PROFILING_SAMPLE_RATE  # noqa: S311
+        with contextlib.ExitStack() as stack:
+            request.profiling_stack = stack
+            request.profiling_sample = stack.enter_context(profile()) if sampled else None
+            response = self.get_response(request)
+
+        sample = request.profiling_sample
+        if sample is not None:
+            endpoint = get_endpoint(request)
+            self.check_budget(request, endpoint, sample)
+            if sampled:
+                observe(endpoint, sample)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Count queries of the view if it has a budget and the request is not sampled."""
+        request.query_budget = settings.QUERY_BUDGETS.get(get_view_name(view_func))
+        if request.query_budget is not None and request.profiling_sample is None:
+            request.profiling_sample = request.profiling_stack.enter_context(profile())
+
+    def check_budget(self, request, endpoint, sample):
+        """Log a warning if the view ran more queries than its budget."""
+        budget = getattr(request, 'query_budget', None)
+        queries_count = sample.measurements['sql_count']
+        if budget is None or queries_count <= budget:
+            return
+        with histograms_lock:
+            budget_exceeded_counts[endpoint] += 1
+        logger.warning(
+            'Query budget exceeded: %s %s ran %d queries, budget is %d',
+            request.method,
+            request.get_full_path(),
+            queries_count,
+            budget,
+        )
+
+
+def render_metrics():
+    """Return histograms in Prometheus text format."""
+    lines = []
+    with histograms_lock:
+        for metric, (metric_help, _) in METRICS.items():
+            name = '{0}_{1}'.format(METRIC_PREFIX, metric)
+            lines.append('# HELP {0} {1}'.format(name, metric_help))
+            lines.append('# TYPE {0} histogram'.format(name))
+            for endpoint, endpoint_histograms in sorted(histograms.items()):
+                histogram = endpoint_histograms[metric]
+                for bound, bucket_count in histogram.get_cumulative_counts():
+                    lines.append('{0}_bucket{{endpoint="{1}",le="{2}"}} {3}'.format(
+                        name, endpoint, bound, bucket_count,
+                    ))
+                lines.append('{0}_sum{{endpoint="{1}"}} {2}'.format(
+                    name, endpoint, histogram.total,
+                ))
+                lines.append('{0}_count{{endpoint="{1}"}} {2}'.format(
+                    name, endpoint, sum(histogram.counts),
+                ))
+        name = '{0}_query_budget_exceeded_total'.format(METRIC_PREFIX)
+        lines.append('# HELP {0} Requests running more queries than budget'.format(name))
+        lines.append('# TYPE {0} counter'.format(name))
+        for endpoint, exceeded_count in sorted(budget_exceeded_counts.items()):
+            lines.append('{0}{{endpoint="{1}"}} {2}'.format(name, endpoint, exceeded_count))
+    return '{0}\n'.format('\n'.join(lines))
+
+
+def is_local_request(request):
+    """Return True if the request came from an allowed address not through a proxy."""
+    proxy_headers = ('HTTP_X_FORWARDED_FOR', 'HTTP_X_REAL_IP', 'HTTP_FORWARDED')
+    return (
+        request.META.get('REMOTE_ADDR') in settings.PROFILING_METRICS_IPS
+        and not any(header in request.META for header in proxy_headers)
+    )
+
+
+def metrics_view(request):
+    """Return histograms of the process to local clients if metrics are enabled."""
+    if not settings.PROFILING_METRICS_ENABLED or not is_local_request(request):
+        raise Http404
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4')
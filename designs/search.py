@@ -0,0 +1,96 @@
+"""
+Full-text search of designs.
+
+Every design stores a search vector built in all site languages, so a query is
+matched with the text search configuration of the active language. Misspelled
+names are found by trigram similarity. Search needs PostgreSQL with `pg_trgm`
+extension, other databases (e.g. SQLite for local development) skip vectors.
+"""
+
+import functools
+import operator
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramSimilarity,
+)
+from django.db import connection
+from django.db.models import F, FloatField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils.translation import get_language
+
+from designs.models import Design, Tag
+
+# Text search configurations of site languages
+SEARCH_CONFIGS = {
+    'en': 'english',
+    'ru': 'russian',
+}
+
+DEFAULT_SEARCH_CONFIG = 'english'
+
+
+def get_tag_names():
+    """Return subquery of space separated tag names of the outer design."""
+    return Subquery(
+        Tag.objects.filter(design=OuterRef('pk')).values('design').annotate(
+            names=StringAgg('name', ' '),
+        ).values('names'),
+    )
+
+
+def get_search_vector():
+    """Return expression of the design's search vector weighted per field."""
+    weighted_fields = (
+        ('name', 'A'),
+        ('designer__name', 'A'),
+        (get_tag_names(), 'B'),
+        ('tiny_description', 'B'),
+        ('description', 'C'),
+    )
+    return functools.reduce(
+        operator.add,
+        [
+            SearchVector(field, weight=weight, config=config)
+            for config in SEARCH_CONFIGS.values()
+            for field, weight in weighted_fields
+        ],
+    )
+
+
+def update_search_vectors(design_ids):
+    """Store search vectors of the designs with a single UPDATE."""
+    if connection.vendor != 'postgresql':
+        return
+    Design.objects.filter(pk__in=design_ids).update(
+        search_vector=Subquery(
+            Design.objects.filter(pk=OuterRef('pk')).annotate(
+                vector=get_search_vector(),
+            ).values('vector'),
+        ),
+    )
+
+
+def get_search_config():
+    """Return text search configuration of the active language."""
+    return SEARCH_CONFIGS.get((get_language() or '').split('-')[0], DEFAULT_SEARCH_CONFIG)
+
+
+def search_designs(designs, query_text):
+    """Return the designs matching the query, the most relevant ones go first."""
+    search_query = SearchQuery(query_text, config=get_search_config(), search_type='websearch')
+    return designs.filter(
+        Q(search_vector=search_query) | Q(name__trigram_similar=query_text),
+    ).annotate(
+        rank=(
+            # Designs without a stored vector yet would have NULL rank, sorted first
+            Coalesce(
+                SearchRank(F('search_vector'), search_query),
+                Value(0, output_field=FloatField()),
+            )
+            + TrigramSimilarity('name', query_text)
+        ),
+    ).order_by('-rank', 'pk')
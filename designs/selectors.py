@@ -1,6 +1,10 @@
 """Selectors and getters for design app."""
 
 from django.conf import settings
+from django.db import connection
+from django.db.models import Count, F, Prefetch, Q, Window
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import RowNumber
 
 from designs.models import Design
 
@@ -11,6 +15,22 @@ def get_enabled_designs(**filters):
     )
 
 
+def get_design_details():
+    """Return enabled designs with everything the design page shows loaded in bulk."""
+    return get_enabled_designs().select_related('propulsion').prefetch_related(
+        'images',
+        'videos',
+        'links',
+        'tags',
+        Prefetch('see_also', queryset=get_enabled_designs()),
+    )
+
+
+def get_similar_designs(slug):
+    """Return enabled designs similar to the design, the most similar first."""
+    return get_enabled_designs(similar_to__design__slug=slug).order_by('similar_to__rank')
+
+
 def get_length_intervals():
     """Return list of length intervals depending on measurement system."""
     if settings.IS_METRIC_SYSTEM:
@@ -18,12 +38,53 @@ def get_length_intervals():
     return ((0, 10), (10, 14), (14, 18), (18, 24), (24, 30), (30, 36), (36, 99))
 
 
+def get_length_filter(from_length, to_length):
+    """Return Q-object selecting designs with LOA inside the length interval."""
+    # metres or feets
+    multiplier = 1000 if settings.IS_METRIC_SYSTEM else 305
+    length_filter = Q()
+    if from_length:
+        length_filter &= Q(loa__gte=multiplier * int(from_length))
+    if to_length:
+        length_filter &= Q(loa__lte=multiplier * int(to_length))
+    return length_filter
+
+
+def get_length_interval_count_rows(**filters):
+    """Return values queryset with `interval_N` design counts per propulsion."""
+    aggregates = {
+        'interval_{0}'.format(index): Count('pk', filter=get_length_filter(*interval))
+        for index, interval in enumerate(get_length_intervals())
+    }
+    designs = get_enabled_designs(**filters).order_by()
+    return designs.values('propulsion').annotate(**aggregates)
+
+
+def get_length_interval_counts(**filters):
+    """
+    Return design counts per length interval for every propulsion.
+
+    All intervals of all propulsions are counted by a single aggregated query.
+    Result is a dict `{propulsion_id: [(from_length, to_length, count), ...]}`,
+    empty intervals are omitted.
+    """
+    intervals = get_length_intervals()
+    return {
+        row['propulsion']: [
+            (from_length, to_length, row['interval_{0}'.format(index)])
+            for index, (from_length, to_length) in enumerate(intervals)
+            if row['interval_{0}'.format(index)]
+        ]
+        for row in get_length_interval_count_rows(**filters)
+    }
+
+
 def get_lengths_for_propulsion(propulsion):
     """Return list of available length intervals for designs of specified propulsion."""
+    counts = get_length_interval_counts(propulsion=propulsion)
     return [
         (from_length, to_length)
-        for from_length, to_length in get_length_intervals()
-        if get_designs_by_length(from_length, to_length, propulsion=propulsion)
+        for from_length, to_length, _count in counts.get(propulsion.pk, [])
     ]
 
 
@@ -39,15 +100,37 @@ def get_length_interval_for_design(design):
 
 
 def get_designs_by_length(from_length, to_length, **filters):
-    qs = get_enabled_designs(**filters)
-    # metres or feets
-    multiplier = 1000 if settings.IS_METRIC_SYSTEM else 305
-    if from_length:
-        qs = qs.filter(loa__gte=multiplier * int(from_length))
-    if to_length:
-        qs = qs.filter(loa__lte=multiplier * int(to_length))
-    return qs
+    return get_enabled_designs(**filters).filter(get_length_filter(from_length, to_length))
 
 
-def get_recent_designs(propulsion):
-    return get_enabled_designs(propulsion=propulsion).order_by('-pk')[:4]
\ No newline at end of file
+def get_recent_designs(count=None):
+    """
+    Return the most recent enabled designs of every propulsion in one query.
+
+    Designs are ranked with ROW_NUMBER() over propulsion partitions. Django can't
+    filter by window functions, so the ranked query is wrapped into a subquery.
+    """
+    if count is None:
+        count = settings.RECENT_DESIGNS_COUNT
+    ranked_designs = get_enabled_designs().annotate(
+        row_number=Window(
+            expression=RowNumber(),
+            partition_by=[F('propulsion')],
+            order_by=F('pk').desc(),
+        ),
+    ).values('id', 'row_number')
+    ranked_sql, ranked_params = ranked_designs.query.sql_with_params()
+    quote_name = connection.ops.quote_name
+    recent_ids = RawSQL(
+        (
+            'SELECT {ranked}.{id} FROM ({ranked_sql}) {ranked} '
+            + 'WHERE {ranked}.{row_number} <= %s'
+        ).format(
+            ranked=quote_name('ranked'),
+            id=quote_name('id'),
+            row_number=quote_name('row_number'),
+            ranked_sql=ranked_sql,
+        ),
+        (*ranked_params, count),
+    )
+    return get_enabled_designs(pk__in=recent_ids).order_by('propulsion', '-pk')
\ No newline at end of file
@@ -0,0 +1,229 @@
+"""Signal handlers for designs application."""
+
+from django.core.signals import setting_changed
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils.autoreload import file_changed
+
+from designs.api.cache import CATALOGUE_SCOPE, get_design_scope, invalidate
+from designs.api.serializers import get_instance_thumbnail_specs
+from designs.cards import drop_design_cards
+from designs.formats import clear_format_caches
+from designs.models import (
+    BoatKind,
+    Design,
+    Designer,
+    HullConstruction,
+    Image,
+    Link,
+    Propulsion,
+    SimilarDesign,
+    Tag,
+    Video,
+)
+from designs.search import update_search_vectors
+from designs.similarity import schedule_similar_designs_update
+from designs.thumbnails import pregenerate_thumbnails
+
+
+@receiver(post_save, sender=Design)
+@receiver(post_save, sender=Image)
+@receiver(post_save, sender=Video)
+@receiver(post_save, sender=Link)
+def pregenerate_api_thumbnails(sender, instance, raw=False, **kwargs):
+    """Render thumbnails used by API in background, so visitors don't wait for them."""
+    if raw:
+        return
+    pregenerate_thumbnails(get_instance_thumbnail_specs(instance))
+
+
+@receiver(post_save, sender=Design)
+@receiver(post_save, sender=Designer)
+def drop_cards(sender, instance, raw=False, **kwargs):
+    """Drop stored API cards of the saved design or the designer's designs."""
+    if raw:
+        return
+    if isinstance(instance, Design):
+        drop_design_cards(Design.objects.filter(pk=instance.pk))
+    else:
+        drop_design_cards(Design.objects.filter(designer=instance))
+
+
+@receiver(post_save, sender=Design)
+@receiver(post_save, sender=Designer)
+@receiver(post_save, sender=Tag)
+def update_saved_search_vectors(sender, instance, raw=False, **kwargs):
+    """Update search vectors of designs containing text of the saved object."""
+    if raw:
+        return
+    if isinstance(instance, Design):
+        update_search_vectors([instance.pk])
+    elif isinstance(instance, Designer):
+        update_search_vectors(instance.designs.values('pk'))
+    else:
+        update_search_vectors(Design.objects.filter(tags=instance).values('pk'))
+
+
+@receiver(m2m_changed, sender=Design.tags.through)
+def update_tagged_search_vectors(sender, instance, action, pk_set, **kwargs):
+    """Update search vectors of designs which tags changed."""
+    if isinstance(instance, Design):
+        if action in {'post_add', 'post_remove', 'post_clear'}:
+            update_search_vectors([instance.pk])
+    elif action in {'post_add', 'post_remove'}:
+        update_search_vectors(pk_set)
+    elif action == 'pre_clear':
+        # The tag's designs are unknown after clearing
+        design_ids = list(Design.objects.filter(tags=instance).values_list('pk', flat=True))
+        transaction.on_commit(lambda: update_search_vectors(design_ids))
+
+
+@receiver(post_save, sender=Design)
+@receiver(post_save, sender=Designer)
+def update_saved_similar_designs(sender, instance, raw=False, **kwargs):
+    """Update similar designs near the saved design or designs of the (dis)abled designer."""
+    if raw:
+        return
+    if isinstance(instance, Design):
+        schedule_similar_designs_update([instance.pk])
+    else:
+        # Designs of the designer could be enabled or disabled
+        schedule_similar_designs_update(instance.designs.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Design)
+def update_deleted_similar_designs(sender, instance, **kwargs):
+    """Update similar designs of designs having the deleted one among them."""
+    design_ids = list(
+        SimilarDesign.objects.filter(similar=instance).values_list('design_id', flat=True),
+    )
+    schedule_similar_designs_update(design_ids)
+
+
+@receiver(m2m_changed, sender=Design.kinds.through)
+def update_kinds_similar_designs(sender, instance, action, pk_set, **kwargs):
+    """Update similar designs near designs which kinds changed."""
+    if isinstance(instance, Design):
+        if action in {'post_add', 'post_remove', 'post_clear'}:
+            schedule_similar_designs_update([instance.pk])
+    elif action in {'post_add', 'post_remove'}:
+        schedule_similar_designs_update(pk_set)
+    elif action == 'pre_clear':
+        schedule_similar_designs_update(
+            Design.objects.filter(kinds=instance).values_list('pk', flat=True),
+        )
+
+
+def invalidate_design_pages(designs):
+    """Drop cached detail responses of the designs."""
+    invalidate(*[get_design_scope(slug) for slug in designs.values_list('slug', flat=True)])
+
+
+def invalidate_designs(designs, catalogue=False):
+    """Drop cached API responses showing the designs, including "see also" cards."""
+    invalidate_design_pages(designs)
+    invalidate_design_pages(Design.objects.filter(see_also__in=designs))
+    if catalogue:
+        invalidate(CATALOGUE_SCOPE)
+
+
+@receiver(pre_save, sender=Design)
+def invalidate_renamed_design(sender, instance, raw=False, **kwargs):
+    """Drop cached response of the design's old URL."""
+    if not raw and instance.pk:
+        old_designs = Design.objects.filter(pk=instance.pk).exclude(slug=instance.slug)
+        invalidate_design_pages(old_designs)
+
+
+@receiver(post_save, sender=Design)
+@receiver(pre_delete, sender=Design)
+def invalidate_design(sender, instance, **kwargs):
+    """Drop cached responses showing the design."""
+    invalidate_designs(Design.objects.filter(pk=instance.pk), catalogue=True)
+
+
+@receiver(post_save, sender=Designer)
+@receiver(pre_delete, sender=Designer)
+def invalidate_designer(sender, instance, **kwargs):
+    """Drop cached responses showing designs of the designer."""
+    invalidate_designs(Design.objects.filter(designer=instance), catalogue=True)
+
+
+@receiver(post_save, sender=Propulsion)
+@receiver(pre_delete, sender=Propulsion)
+def invalidate_propulsion(sender, instance, **kwargs):
+    """Drop cached responses showing the propulsion."""
+    invalidate_designs(Design.objects.filter(propulsion=instance), catalogue=True)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def invalidate_tag(sender, instance, **kwargs):
+    """Drop cached responses of designs with the tag and facet counts."""
+    invalidate_design_pages(Design.objects.filter(tags=instance))
+    invalidate(CATALOGUE_SCOPE)
+
+
+@receiver(post_save, sender=HullConstruction)
+@receiver(pre_delete, sender=HullConstruction)
+@receiver(post_save, sender=BoatKind)
+@receiver(pre_delete, sender=BoatKind)
+def invalidate_facet(sender, instance, **kwargs):
+    """Drop cached facet counts showing the hull construction or boat kind."""
+    invalidate(CATALOGUE_SCOPE)
+
+
+@receiver(post_save, sender=Image)
+@receiver(post_delete, sender=Image)
+@receiver(post_save, sender=Video)
+@receiver(post_delete, sender=Video)
+@receiver(post_save, sender=Link)
+@receiver(post_delete, sender=Link)
+def invalidate_design_media(sender, instance, **kwargs):
+    """Drop cached response and stored cards of the design showing the media."""
+    designs = Design.objects.filter(pk=instance.design_id)
+    invalidate_design_pages(designs)
+    drop_design_cards(designs)
+
+
+@receiver(m2m_changed, sender=Design.tags.through)
+@receiver(m2m_changed, sender=Design.see_also.through)
+def invalidate_design_relations(sender, instance, action, model, pk_set, **kwargs):
+    """Drop cached responses of designs which tags or "see also" designs changed."""
+    if action not in {'post_add', 'post_remove', 'pre_clear'}:
+        return
+
+    if sender is Design.tags.through:
+        # Facet counts
+        invalidate(CATALOGUE_SCOPE)
+
+    design_ids = {instance.pk} if isinstance(instance, Design) else set()
+    if model is Design:
+        if action == 'pre_clear':
+            relation = 'see_also' if sender is Design.see_also.through else 'tags'
+            pk_set = Design.objects.filter(**{relation: instance}).values_list('pk', flat=True)
+        design_ids.update(pk_set)
+    invalidate_design_pages(Design.objects.filter(pk__in=design_ids))
+
+
+@receiver(m2m_changed, sender=Design.hull_constructions.through)
+@receiver(m2m_changed, sender=Design.kinds.through)
+def invalidate_design_facets(sender, action, **kwargs):
+    """Drop cached facet counts when hull constructions or kinds of designs changed."""
+    if action in {'post_add', 'post_remove', 'pre_clear'}:
+        invalidate(CATALOGUE_SCOPE)
+
+
+@receiver(file_changed)
+def clear_reloaded_formats(sender, file_path, **kwargs):
+    """Drop memoized formats when translation catalogues are reloaded by the dev server."""
+    if file_path.suffix == '.mo':
+        clear_format_caches()
+
+
+@receiver(setting_changed)
+def clear_translated_formats(setting, **kwargs):
+    """Drop memoized formats when translation settings change (e.g. in tests)."""
+    if setting in {'LANGUAGES', 'LANGUAGE_CODE', 'LOCALE_PATHS'}:
+        clear_format_caches()
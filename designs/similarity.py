@@ -0,0 +1,349 @@
+"""
+Similar designs by dimensions.
+
+Every enabled design is a vector of its dimensions and one-hot encoded hull
+type, propulsion and boat kinds. Dimensions are log-scaled and standardized,
+missing ones are average. Vectors are kept in a matrix of the process, which
+is synced with the database incrementally: only designs updated since the
+last sync are read again. Means and deviations of dimensions are kept until
+the number of designs changes notably, so vectors of other designs don't move.
+
+Nearest designs of every design are stored in `SimilarDesign` table, so API
+doesn't compute anything per request. When designs change, only designs
+which had them among the nearest or would have them now are recomputed after
+the transaction commit, in a background thread unless
+`SIMILAR_DESIGNS_IN_BACKGROUND` is off. The first sync of a
+process loads the index without recomputing stored designs, the whole table
+is rebuilt by `update_similar_designs` command.
+"""
+
+import itertools
+import logging
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+
+import numpy as np
+from django.conf import settings
+from django.db import connections, transaction
+
+from designs.api.cache import CATALOGUE_SCOPE, invalidate
+from designs.models import HULL_TYPES, BoatKind, Design, Propulsion, SimilarDesign
+from designs.selectors import get_enabled_designs
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_FEATURES = ('loa', 'lwl', 'beam', 'draft', 'weight', 'displacement', 'sail_area')
+
+# Weights of one-hot columns relative to standardized dimensions
+CATEGORY_WEIGHTS = {
+    'hull_type': 1.0,
+    'propulsion': 2.0,
+    'kinds': 1.0,
+}
+
+# Rows of the matrix compared with the whole matrix at once
+BLOCK_SIZE = 512
+
+# Maximum of designs read from the database by one query
+SYNC_CHUNK_SIZE = 1000
+
+# Relative change of the number of designs making dimensions standardized again
+RESCALE_THRESHOLD = 0.1
+
+
+def iterate_chunks(items, chunk_size):
+    """Yield lists of the items, `chunk_size` items at most."""
+    items = iter(items)
+    while True:
+        chunk = list(itertools.islice(items, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def get_categories():
+    """Return `(feature, value)` pairs of one-hot columns of the current database."""
+    return (
+        *(('hull_type', hull_type) for hull_type, _ in HULL_TYPES),
+        *(('propulsion', pk) for pk in Propulsion.objects.order_by('pk').values_list(
+            'pk', flat=True,
+        )),
+        *(('kinds', pk) for pk in BoatKind.objects.order_by('pk').values_list(
+            'pk', flat=True,
+        )),
+    )
+
+
+class DesignFeatures(object):
+    """Dimensions and one-hot encoded categories of designs, a row per design."""
+
+    def __init__(self, categories=()):
+        """Create features without designs, with one-hot columns of the categories."""
+        self.categories = tuple(categories)
+        self.category_columns = {
+            category: column for column, category in enumerate(self.categories)
+        }
+        self.design_ids = np.empty(0, dtype=np.int64)
+        self.rows = {}
+        self.dimensions = np.empty((0, len(NUMERIC_FEATURES)))
+        self.one_hot = np.empty((0, len(self.categories)))
+
+    def remove(self, design_ids):
+        """Remove rows of the designs."""
+        if not design_ids:
+            return
+        kept = ~np.isin(self.design_ids, list(design_ids))
+        self.design_ids = self.design_ids[kept]
+        self.dimensions = self.dimensions[kept]
+        self.one_hot = self.one_hot[kept]
+        self.rows = {pk: row for row, pk in enumerate(self.design_ids.tolist())}
+
+    def update(self, design_ids):
+        """Read rows of the designs, replace existing rows and append new ones."""
+        design_rows = Design.objects.filter(pk__in=design_ids).values_list(
+            'pk', 'hull_type', 'propulsion_id', *NUMERIC_FEATURES,
+        )
+        dimensions = {}
+        one_hot = {pk: np.zeros(len(self.categories)) for pk in design_ids}
+        for pk, hull_type, propulsion_id, *design_dimensions in design_rows:
+            dimensions[pk] = [
+                np.nan if dimension is None else float(dimension)
+                for dimension in design_dimensions
+            ]
+            self.set_category(one_hot[pk], 'hull_type', hull_type)
+            self.set_category(one_hot[pk], 'propulsion', propulsion_id)
+        kind_rows = Design.kinds.through.objects.filter(design_id__in=design_ids).values_list(
+            'design_id', 'boatkind_id',
+        )
+        for pk, kind_id in kind_rows:
+            self.set_category(one_hot[pk], 'kinds', kind_id)
+
+        new_ids = [pk for pk in dimensions if pk not in self.rows]
+        for pk in dimensions:
+            if pk in self.rows:
+                self.dimensions[self.rows[pk]] = dimensions[pk]
+                self.one_hot[self.rows[pk]] = one_hot[pk]
+        if new_ids:
+            self.rows.update(
+                (pk, row) for row, pk in enumerate(new_ids, len(self.design_ids))
+            )
+            self.design_ids = np.concatenate([self.design_ids, new_ids])
+            self.dimensions = np.concatenate(
+                [self.dimensions, [dimensions[pk] for pk in new_ids]],
+            )
+            self.one_hot = np.concatenate([self.one_hot, [one_hot[pk] for pk in new_ids]])
+
+    def set_category(self, one_hot, feature, category_value):
+        """Set the weighted one-hot column of the category."""
+        column = self.category_columns.get((feature, category_value))
+        if column is not None:
+            one_hot[column] = CATEGORY_WEIGHTS[feature]
+
+    def get_log_dimensions(self):
+        """Return matrix of log dimensions, missing ones are NaN."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.log(np.where(self.dimensions > 0, self.dimensions, np.nan))
+
+    def get_scale(self):
+        """Return means and deviations of log dimensions."""
+        log_dimensions = self.get_log_dimensions()
+        with warnings.catch_warnings():
+            # Dimensions missing in all designs are all-NaN columns
+            warnings.simplefilter('ignore', RuntimeWarning)
+            return np.nanmean(log_dimensions, axis=0), np.nanstd(log_dimensions, axis=0)
+
+    def get_vectors(self, scale):
+        """Return matrix of log dimensions standardized with the scale and one-hot columns."""
+        means, deviations = scale
+        with np.errstate(divide='ignore', invalid='ignore'):
+            standardized = (self.get_log_dimensions() - means) / deviations
+        standardized = np.nan_to_num(standardized, nan=0, posinf=0, neginf=0)
+        return np.hstack([standardized, self.one_hot])
+
+
+class SimilarityIndex(object):
+    """Matrix of design vectors synced with the database."""
+
+    def __init__(self):
+        """Create an empty index."""
+        self.reset(())
+
+    def reset(self, categories):
+        """Drop all designs, set one-hot columns of the categories."""
+        self.features = DesignFeatures(categories)
+        self.last_updates = {}
+        self.vectors = np.empty((0, len(NUMERIC_FEATURES) + len(self.features.categories)))
+        self.squared_norms = np.empty(0)
+        # Means and deviations of log dimensions, number of designs they were computed for
+        self.scale = None
+        self.scaled_count = 0
+
+    def sync(self, design_ids=(), rebuild=False):
+        """
+        Read designs changed since the last sync and the given ones, return changed ids.
+
+        The first sync loads all designs, their similar designs are already
+        stored, so only the given designs are returned as changed.
+        """
+        is_loaded = self.scale is not None
+        categories = get_categories()
+        if rebuild or categories != self.features.categories:
+            self.reset(categories)
+        last_updates = dict(get_enabled_designs().values_list('pk', 'last_update'))
+        removed_ids = set(self.features.rows) - set(last_updates)
+        changed_ids = {
+            pk
+            for pk, last_update in last_updates.items()
+            if pk not in self.features.rows or last_update != self.last_updates[pk]
+        }
+        changed_ids.update(set(design_ids) & set(last_updates))
+        self.features.remove(removed_ids)
+        for chunk in iterate_chunks(sorted(changed_ids), SYNC_CHUNK_SIZE):
+            self.features.update(chunk)
+        self.last_updates = last_updates
+        if removed_ids or changed_ids:
+            if self.is_scale_outdated():
+                self.scale = self.features.get_scale()
+                self.scaled_count = len(self.features.design_ids)
+                # All vectors moved
+                changed_ids.update(self.features.rows)
+            self.vectors = self.features.get_vectors(self.scale)
+            self.squared_norms = np.einsum('ij,ij->i', self.vectors, self.vectors)
+        if not is_loaded and not rebuild:
+            return set(design_ids)
+        return removed_ids | changed_ids
+
+    def is_scale_outdated(self):
+        """Return True if dimensions should be standardized again."""
+        if self.scale is None:
+            return True
+        changed_count = abs(len(self.features.design_ids) - self.scaled_count)
+        return changed_count > self.scaled_count * RESCALE_THRESHOLD
+
+    def get_squared_distances(self, rows):
+        """Return matrix of squared distances of the rows to all rows."""
+        vectors = self.vectors[rows]
+        squared_distances = (
+            self.squared_norms[rows][:, np.newaxis]
+            + self.squared_norms[np.newaxis, :]
+            - 2 * vectors @ self.vectors.T
+        )
+        return np.maximum(squared_distances, 0)
+
+    def get_nearest(self, design_ids, count):
+        """Return `{design id: [(nearest design id, distance), ...]}`, nearest first."""
+        all_ids = self.features.design_ids
+        count = min(count, len(all_ids) - 1)
+        rows = [self.features.rows[pk] for pk in design_ids if pk in self.features.rows]
+        nearest = {int(all_ids[row]): [] for row in rows}
+        if count <= 0:
+            return nearest
+        for block in iterate_chunks(rows, BLOCK_SIZE):
+            squared_distances = self.get_squared_distances(block)
+            squared_distances[np.arange(len(block)), block] = np.inf
+            nearest_rows = np.argpartition(squared_distances, count - 1, axis=1)[:, :count]
+            for row, row_distances, row_nearest in zip(block, squared_distances, nearest_rows):
+                row_nearest = row_nearest[np.argsort(row_distances[row_nearest])]
+                nearest[int(all_ids[row])] = list(zip(
+                    all_ids[row_nearest].tolist(),
+                    np.sqrt(row_distances[row_nearest]).tolist(),
+                ))
+        return nearest
+
+    def get_closer_designs(self, design_ids, distances):
+        """Return ids of designs closer to any of the designs than `{id: distance}`."""
+        all_ids = self.features.design_ids
+        rows = [self.features.rows[pk] for pk in design_ids if pk in self.features.rows]
+        limits = np.array([distances.get(pk, np.inf) for pk in all_ids.tolist()]) ** 2
+        closer = np.zeros(len(all_ids), dtype=bool)
+        for block in iterate_chunks(rows, BLOCK_SIZE):
+            closer |= (self.get_squared_distances(block) < limits).any(axis=0)
+        return set(all_ids[closer].tolist())
+
+
+similarity_index = SimilarityIndex()
+similarity_lock = threading.Lock()
+
+
+def get_affected_designs(changed_ids, count):
+    """Return ids of designs which nearest designs could change with the changed designs."""
+    if len(changed_ids) * 4 > len(similarity_index.features.design_ids):
+        return set(similarity_index.features.rows)
+    farthest_distances = dict(
+        SimilarDesign.objects.filter(rank=count - 1).values_list('design_id', 'distance'),
+    )
+    return (
+        set(changed_ids)
+        | set(SimilarDesign.objects.filter(similar__in=changed_ids).values_list(
+            'design_id', flat=True,
+        ))
+        | similarity_index.get_closer_designs(changed_ids, farthest_distances)
+    )
+
+
+def save_similar_designs(design_ids, count):
+    """Store nearest designs of the designs."""
+    for chunk in iterate_chunks(design_ids, SYNC_CHUNK_SIZE):
+        nearest = similarity_index.get_nearest(chunk, count)
+        with transaction.atomic():
+            SimilarDesign.objects.filter(design_id__in=chunk).delete()
+            SimilarDesign.objects.bulk_create([
+                SimilarDesign(
+                    design_id=design_id,
+                    similar_id=similar_id,
+                    rank=rank,
+                    distance=distance,
+                )
+                for design_id, design_nearest in nearest.items()
+                for rank, (similar_id, distance) in enumerate(design_nearest)
+            ])
+
+
+def update_similar_designs(design_ids=(), rebuild=False):
+    """
+    Sync the index with the database, store nearest designs of affected designs.
+
+    The given designs are read again even if they were not updated, e.g. after
+    their kinds were changed. With `rebuild` the index is built from scratch
+    and nearest designs of all designs are stored again.
+    """
+    count = settings.SIMILAR_DESIGNS_COUNT
+    with similarity_lock:
+        changed_ids = similarity_index.sync(design_ids, rebuild=rebuild)
+        affected_ids = get_affected_designs(changed_ids, count)
+        save_similar_designs(sorted(affected_ids), count)
+    invalidate(CATALOGUE_SCOPE)
+    return affected_ids
+
+
+@lru_cache(maxsize=None)
+def get_executor():
+    """Return worker updating similar designs of saved designs."""
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix='similarity')
+
+
+def run_similar_designs_update(design_ids):
+    """Update similar designs near the designs, it is a worker task."""
+    try:
+        update_similar_designs(design_ids)
+    except Exception:
+        logger.exception('Similar designs update failed')
+    finally:
+        # The worker has its own DB connections
+        connections.close_all()
+
+
+def submit_similar_designs_update(design_ids):
+    """Run the update in the background worker, see `SIMILAR_DESIGNS_IN_BACKGROUND`."""
+    get_executor().submit(run_similar_designs_update, design_ids)
+
+
+def schedule_similar_designs_update(design_ids):
+    """Update similar designs near the designs after transaction commit."""
+    if settings.SIMILAR_DESIGNS_IN_BACKGROUND:
+        update = submit_similar_designs_update
+    else:
+        update = update_similar_designs
+    transaction.on_commit(partial(update, list(design_ids)))
@@ -0,0 +1,107 @@
+"""Synthetic catalogue generator for benchmarks."""
+
+import random
+
+from designs.models import Design, Designer, Image, Propulsion
+
+PROPULSIONS = (
+    ('sail', 'Sail', 'Sailboats'),
+    ('oars', 'Oars', 'Rowing boats'),
+    ('motor', 'Motor', 'Motorboats'),
+)
+
+HULL_TYPES_WEIGHTS = (('mono', 80), ('catamaran', 15), ('trimaran', 5))
+
+
+def get_propulsions():
+    """Return propulsions used by synthetic designs, create them if needed."""
+    return [
+        Propulsion.objects.get_or_create(
+            slug=slug,
+            defaults={'name': name, 'long_name': long_name, 'order': order},
+        )[0]
+        for order, (slug, name, long_name) in enumerate(PROPULSIONS)
+    ]
+
+
+def generate_dimensions(rnd):
+    """
+    Return realistic dimensions of a boat, millimeters, grams and m2.
+
+    >>> dimensions = generate_dimensions(random.Random(1))
+    >>> 1500 <= dimensions['loa'] <= 25000
+    True
+    >>> dimensions['lwl'] < dimensions['loa']
+    True
+    """
+    # Most of home-built boats are 3-8 meters long
+    loa = int(min(max(rnd.lognormvariate(8.5, 0.45), 1500), 25000))
+    beam = int(loa * rnd.uniform(0.25, 0.45))
+    weight = int((loa / 1000) ** 3 * rnd.uniform(8000, 30000))
+    return {
+        'loa': loa,
+        'lwl': int(loa * rnd.uniform(0.8, 0.95)),
+        'beam': beam,
+        'draft': int(beam * rnd.uniform(0.1, 0.6)),
+        'weight': weight,
+        'displacement': int(weight * rnd.uniform(1.3, 2)),
+        'sail_area': round((loa / 1000) ** 2 * rnd.uniform(0.3, 0.8), 1),
+    }
+
+
+def generate_catalogue(designs_count, designers_count=100, images_per_design=0, seed=0):
+    """
+    Create synthetic designers, designs and images with bulk inserts.
+
+    Images point to `image` file name, so thumbnails should be stubbed or the
+    file should be put to the storage by the caller.
+    """
+    rnd = random.Random(seed)
+    propulsions = get_propulsions()
+    prefix = 'synthetic-{0}'.format(seed)
+    Designer.objects.bulk_create(
+        Designer(
+            slug='{0}-designer-{1}'.format(prefix, index),
+            name='Designer {0}'.format(index),
+            enabled=rnd.random() > 0.02,
+        )
+        for index in range(designers_count)
+    )
+    designers = list(Designer.objects.filter(slug__startswith=prefix))
+
+    hull_types, hull_weights = zip(*HULL_TYPES_WEIGHTS)
+    Design.objects.bulk_create(
+        (
+            Design(
+                slug='{0}-design-{1}'.format(prefix, index),
+                name='Boat {0}'.format(index),
+                tiny_description='synthetic boat',
+                description='Synthetic boat #{0}'.format(index),
+                designer=rnd.choice(designers),
+                propulsion=rnd.choices(propulsions, weights=(60, 15, 25))[0],
+                hull_type=rnd.choices(hull_types, weights=hull_weights)[0],
+                image='synthetic/boat.jpg',
+                enabled=rnd.random() > 0.05,
+                **generate_dimensions(rnd),
+            )
+            for index in range(designs_count)
+        ),
+        batch_size=1000,
+    )
+
+    if images_per_design:
+        designs = Design.objects.filter(slug__startswith=prefix)
+        design_ids = designs.values_list('pk', flat=True)
+        Image.objects.bulk_create(
+            (
+                Image(
+                    design_id=design_id,
+                    image_type='drawing' if order % 2 else 'photo',
+                    image='synthetic/boat.jpg',
+                    order=order,
+                )
+                for design_id in design_ids.iterator()
+                for order in range(images_per_design)
+            ),
+            batch_size=1000,
+        )
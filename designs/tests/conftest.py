@@ -0,0 +1,68 @@
+import io
+
+import pytest
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image as PilImage
+
+from designs.models import Design, Designer, Propulsion
+
+TEST_IMAGE = 'test/boat.jpg'
+
+
+@pytest.fixture(autouse=True)
+def local_services(settings, tmp_path):
+    """Keep cache and media in the process, don't run anything in background."""
+    settings.CACHES = {
+        'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    }
+    # Local memory caches outlive the setting, drop thumbnails of other tests
+    cache.clear()
+    settings.MEDIA_ROOT = str(tmp_path)
+    settings.THUMBNAIL_PREGENERATE_WORKERS = 0
+    settings.SIMILAR_DESIGNS_IN_BACKGROUND = False
+    settings.QUERY_BUDGETS = {}
+    settings.PROFILING_SAMPLE_RATE = 0
+    # Development toolbar renders itself for superusers
+    settings.MIDDLEWARE = [
+        middleware for middleware in settings.MIDDLEWARE if 'debug_toolbar' not in middleware
+    ]
+
+
+@pytest.fixture
+def test_image():
+    """Put a JPEG image to media storage, return its name."""
+    image_file = io.BytesIO()
+    PilImage.new('RGB', (800, 600), (40, 90, 160)).save(image_file, 'JPEG')
+    return default_storage.save(TEST_IMAGE, ContentFile(image_file.getvalue()))
+
+
+@pytest.fixture
+def propulsion(db):
+    return Propulsion.objects.create(slug='sail', name='Sail', long_name='Sailboats', order=0)
+
+
+@pytest.fixture
+def designer(db):
+    return Designer.objects.create(slug='welsford', name='John Welsford')
+
+
+@pytest.fixture
+def make_design(designer, propulsion, test_image):
+    """Return function creating an enabled design."""
+    def factory(slug, **fields):
+        return Design.objects.create(**{
+            'slug': slug,
+            'name': slug.title(),
+            'tiny_description': 'small boat',
+            'description': 'A small boat.',
+            'designer': designer,
+            'propulsion': propulsion,
+            'hull_type': 'mono',
+            'image': test_image,
+            'loa': 5000,
+            'beam': 1500,
+            **fields,
+        })
+    return factory
@@ -0,0 +1,18 @@
+import pytest
+
+# Session, user, total count of designs, page of designs with designers and propulsions
+DESIGN_CHANGELIST_QUERIES = 4
+
+
+@pytest.mark.parametrize('designs_count', [1, 10])
+def test_design_changelist_queries(admin_client, make_design, designs_count,
+                                   django_assert_num_queries):
+    for index in range(designs_count):
+        make_design('boat-{0}'.format(index))
+    # Choices of list filters are cached
+    assert admin_client.get('/admin/designs/design/').status_code == 200
+
+    with django_assert_num_queries(DESIGN_CHANGELIST_QUERIES):
+        response = admin_client.get('/admin/designs/design/')
+
+    assert response.status_code == 200
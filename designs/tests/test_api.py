@@ -0,0 +1,61 @@
+import pytest
+
+from designs.api.cache import CATALOGUE_SCOPE, get_design_scope, invalidate
+from designs.models import Image, Link, Video
+
+# Design with propulsion and designer, images, videos, links, tags and "see also" designs
+DESIGN_DETAIL_QUERIES = 6
+
+
+def add_media(design, count, make_design, test_image):
+    """Add `count` images, videos, links and "see also" designs to the design."""
+    for order in range(count):
+        Image.objects.create(
+            design=design, image_type='photo', image=test_image, order=order,
+        )
+        Video.objects.create(
+            design=design, video_type='youtube', video_id=str(order), image=test_image,
+            order=order,
+        )
+        Link.objects.create(
+            design=design, link_type='site', url='https://example.com/', image=test_image,
+            order=order,
+        )
+        design.see_also.add(make_design('{0}-related-{1}'.format(design.slug, order)))
+
+
+@pytest.mark.parametrize('media_count', [1, 5])
+def test_design_detail_queries(client, make_design, test_image, media_count,
+                               django_assert_num_queries):
+    design = make_design('tom-cat')
+    add_media(design, media_count, make_design, test_image)
+    url = '/api/designs/{0}/{1}/'.format(design.designer.slug, design.slug)
+    # Generate thumbnails, only the rendered response should be missing
+    assert client.get(url).status_code == 200
+    invalidate(get_design_scope(design.slug), CATALOGUE_SCOPE)
+
+    with django_assert_num_queries(DESIGN_DETAIL_QUERIES):
+        response = client.get(url)
+
+    assert response.status_code == 200
+    assert len(response.json()['seeAlso']) == media_count
+
+
+def test_design_list_invalid_dimension(client, propulsion):
+    response = client.get('/api/designs/', {'propulsion': 'sail', 'loa_min': 'abc'})
+
+    assert response.status_code == 400
+    assert response.json() == {'loaMin': 'Invalid value: abc'}
+
+
+def test_design_detail_etag_changes_with_media(client, make_design, test_image):
+    design = make_design('tom-cat')
+    url = '/api/designs/{0}/{1}/'.format(design.designer.slug, design.slug)
+    response = client.get(url)
+    etag = response['ETag']
+
+    # Adding media doesn't touch any timestamp of the design, only the ETag tells
+    assert 'Last-Modified' not in response
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+    Image.objects.create(design=design, image_type='photo', image=test_image, order=0)
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
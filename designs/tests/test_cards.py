@@ -0,0 +1,39 @@
+import pytest
+
+from designs.cards import get_design_cards
+from designs.models import Design, DesignCard, Image
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+def test_saved_design_cards_are_rendered_on_request(make_design):
+    design = make_design('tom-cat')
+    get_design_cards(Design.objects.filter(pk=design.pk), 'card')
+
+    design.name = 'Tom Kitten'
+    design.save()
+
+    # Saving doesn't render anything, the next request does
+    assert not DesignCard.objects.exists()
+    cards = get_design_cards(Design.objects.filter(pk=design.pk), 'card')
+    assert cards[0]['name'] == 'Tom Kitten'
+
+
+def test_design_media_drops_cards(make_design, test_image):
+    design = make_design('tom-cat')
+    get_design_cards(Design.objects.filter(pk=design.pk), 'card')
+
+    Image.objects.create(design=design, image_type='photo', image=test_image, order=0)
+
+    assert not DesignCard.objects.exists()
+
+
+def test_cards_of_other_thumbnail_settings_are_rendered_again(make_design):
+    design = make_design('tom-cat')
+    get_design_cards(Design.objects.filter(pk=design.pk), 'card')
+    DesignCard.objects.update(thumbnails_version='old')
+
+    cards = get_design_cards(Design.objects.filter(pk=design.pk), 'card')
+
+    assert cards[0]['slug'] == 'tom-cat'
+    assert not DesignCard.objects.filter(thumbnails_version='old').exists()
@@ -0,0 +1,63 @@
+import base64
+import csv
+import io
+import json
+
+import numpy as np
+import pytest
+
+from designs.export import DIMENSION_FIELDS, EXPORT_COLUMNS, RELATED_FIELDS
+
+COLUMNS = [column for column, _ in EXPORT_COLUMNS] + list(RELATED_FIELDS)
+
+
+def get_export(client, export_format):
+    response = client.get('/api/designs/export/{0}/'.format(export_format))
+    assert response.status_code == 200
+    return b''.join(response.streaming_content).decode()
+
+
+@pytest.mark.parametrize('export_format', ['jsonl', 'csv', 'columns'])
+def test_export_is_for_staff_only(client, propulsion, export_format):
+    response = client.get('/api/designs/export/{0}/'.format(export_format))
+
+    assert response.status_code == 403
+
+
+def test_export_jsonl(admin_client, make_design):
+    make_design('tom-cat')
+    make_design('jack-cat', beam=None)
+
+    rows = [json.loads(line) for line in get_export(admin_client, 'jsonl').splitlines()]
+
+    assert [list(row) for row in rows] == [COLUMNS, COLUMNS]
+    assert [(row['slug'], row['beam']) for row in rows] == [
+        ('tom-cat', 1500), ('jack-cat', None),
+    ]
+
+
+def test_export_csv(admin_client, make_design):
+    make_design('tom-cat')
+
+    rows = list(csv.reader(io.StringIO(get_export(admin_client, 'csv'))))
+
+    assert rows[0] == COLUMNS
+    assert len(rows) == 2
+    assert dict(zip(rows[0], rows[1]))['slug'] == 'tom-cat'
+
+
+def test_export_columns(admin_client, make_design):
+    make_design('tom-cat')
+    make_design('jack-cat', beam=None)
+
+    groups = [json.loads(line) for line in get_export(admin_client, 'columns').splitlines()]
+
+    assert len(groups) == 1
+    group = groups[0]
+    assert group['rows'] == 2
+    assert set(group['columns']) == set(COLUMNS) - set(DIMENSION_FIELDS)
+    assert group['columns']['slug'] == ['tom-cat', 'jack-cat']
+    assert list(group['packed']) == list(DIMENSION_FIELDS)
+    beams = np.frombuffer(base64.b64decode(group['packed']['beam']), group['dtype'])
+    assert beams[0] == 1500
+    assert np.isnan(beams[1])
@@ -0,0 +1,23 @@
+from django.http import QueryDict
+
+from designs.api.filters import DesignFilterSet
+from designs.facets import CHOICE_FACETS, get_choice_facet_counts
+from designs.selectors import get_enabled_designs
+
+
+def test_choice_facet_counts(make_design, django_assert_num_queries):
+    make_design('tom-cat', hull_type='catamaran')
+    make_design('jack-cat', hull_type='catamaran', engine_type='o')
+    make_design('dory', engine_type='o')
+    filterset = DesignFilterSet(
+        QueryDict('propulsion=sail&hull_type=catamaran'),
+        queryset=get_enabled_designs(),
+    )
+    assert filterset.is_valid()
+
+    with django_assert_num_queries(len(CHOICE_FACETS)):
+        facet_counts = get_choice_facet_counts(filterset)
+
+    # Counts of a facet ignore the facet's own filter
+    assert [choice['count'] for choice in facet_counts['hull_type']] == [1, 2, 0]
+    assert [choice['count'] for choice in facet_counts['engine_type']] == [1, 0]
@@ -0,0 +1,88 @@
+import io
+import json
+
+from django.core.management import call_command
+
+from designs.models import Design
+
+DESIGN_ROW = {
+    'slug': 'tom-cat',
+    'designer': 'welsford',
+    'propulsion': 'sail',
+    'name': 'Tom Cat',
+    'tiny_description': 'small boat',
+    'description': 'A small boat.',
+    'hull_type': 'mono',
+    'loa': '5 m',
+}
+
+
+def import_designs(path):
+    stderr = io.StringIO()
+    call_command('import_designs', str(path), stdout=io.StringIO(), stderr=stderr)
+    return stderr.getvalue()
+
+
+def test_import_skips_malformed_json_line(tmp_path, propulsion):
+    path = tmp_path / 'designs.jsonl'
+    path.write_text('\n'.join([
+        json.dumps(DESIGN_ROW),
+        '{"slug": "broken",',
+        '["not", "an", "object"]',
+        json.dumps({**DESIGN_ROW, 'slug': 'fat-cat'}),
+    ]))
+
+    errors = import_designs(path)
+
+    assert 'Line 2 skipped' in errors
+    assert 'Line 3 skipped' in errors
+    assert set(Design.objects.values_list('slug', flat=True)) == {'tom-cat', 'fat-cat'}
+
+
+def test_import_keeps_tags_of_empty_csv_cell(tmp_path, propulsion):
+    path = tmp_path / 'designs.csv'
+    header = ','.join([*DESIGN_ROW, 'tags'])
+    values = ','.join(DESIGN_ROW.values())
+    path.write_text('{0}\n{1},"dinghy,plywood"\n'.format(header, values))
+    import_designs(path)
+    path.write_text('{0}\n{1},\n'.format(header, values))
+
+    import_designs(path)
+
+    tags = Design.objects.get(slug='tom-cat').tags.values_list('slug', flat=True)
+    assert set(tags) == {'dinghy', 'plywood'}
+
+
+def test_import_updates_designs_and_media(tmp_path, propulsion):
+    path = tmp_path / 'designs.jsonl'
+    images = [
+        {'image_type': 'photo', 'title': 'Sailing', 'image_url': 'https://example.com/1.jpg'},
+        {'image_type': 'photo', 'title': 'Beach', 'image_url': 'https://example.com/2.jpg'},
+    ]
+    path.write_text(json.dumps({**DESIGN_ROW, 'tags': 'dinghy', 'images': images}))
+    import_designs(path)
+    path.write_text(json.dumps({
+        **DESIGN_ROW,
+        'name': 'Tom Kitten',
+        'designer_name': 'John Welsford',
+        'tags': ['dinghy', 'plywood'],
+        'images': [{**images[0], 'title': 'Reaching'}],
+    }))
+
+    errors = import_designs(path)
+
+    design = Design.objects.get(slug='tom-cat')
+    assert not errors
+    assert (design.name, design.designer.name) == ('Tom Kitten', 'John Welsford')
+    assert set(design.tags.values_list('slug', flat=True)) == {'dinghy', 'plywood'}
+    assert list(design.images.values_list('order', 'title')) == [(0, 'Reaching')]
+
+
+def test_import_reports_invalid_media(tmp_path, propulsion):
+    path = tmp_path / 'designs.jsonl'
+    path.write_text(json.dumps({**DESIGN_ROW, 'images': ['not an object']}))
+
+    errors = import_designs(path)
+
+    assert "Line 1 skipped: {'images': ['Not a list of objects']}" in errors
+    assert not Design.objects.exists()
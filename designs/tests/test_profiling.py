@@ -0,0 +1,90 @@
+import logging
+
+import pytest
+
+from designs import profiling
+
+
+@pytest.fixture
+def design_url(make_design):
+    design = make_design('tom-cat')
+    return '/api/designs/{0}/{1}/'.format(design.designer.slug, design.slug)
+
+
+@pytest.fixture
+def profiled_requests(monkeypatch):
+    """Collect samples of profiled requests."""
+    samples = []
+    profile = profiling.profile
+
+    def profile_spy():
+        context = profile()
+        samples.append(context)
+        return context
+
+    monkeypatch.setattr(profiling, 'profile', profile_spy)
+    return samples
+
+
+def test_views_without_budget_are_not_profiled(client, settings, design_url,
+                                               profiled_requests):
+    settings.QUERY_BUDGETS = {'DesignDetailView': 100}
+
+    assert client.get('/api/site-info/').status_code == 200
+    assert not profiled_requests
+    assert client.get(design_url).status_code == 200
+    assert len(profiled_requests) == 1
+
+
+def test_query_budget_exceeded(client, settings, design_url, caplog):
+    settings.QUERY_BUDGETS = {'DesignDetailView': 1}
+    endpoint = 'api/designs/<designer>/<slug>/'
+    exceeded_count = profiling.budget_exceeded_counts[endpoint]
+
+    with caplog.at_level(logging.WARNING, logger='designs.profiling'):
+        client.get(design_url)
+
+    assert 'Query budget exceeded: GET {0}'.format(design_url) in caplog.text
+    assert profiling.budget_exceeded_counts[endpoint] == exceeded_count + 1
+
+
+def test_sampled_requests_metrics(client, settings, design_url):
+    settings.PROFILING_SAMPLE_RATE = 1
+    settings.PROFILING_METRICS_ENABLED = True
+    client.get(design_url)
+
+    response = client.get('/metrics/', REMOTE_ADDR='127.0.0.1')
+
+    assert response.status_code == 200
+    assert 'boatplans_sql_count_count{endpoint="api/designs/<designer>/<slug>/"}' in (
+        response.content.decode()
+    )
+
+
+@pytest.mark.parametrize('headers', [
+    {'REMOTE_ADDR': '10.0.0.1'},
+    {'REMOTE_ADDR': '127.0.0.1', 'HTTP_X_FORWARDED_FOR': '10.0.0.1'},
+])
+def test_metrics_of_remote_clients(client, settings, headers):
+    settings.PROFILING_METRICS_ENABLED = True
+
+    assert client.get('/metrics/', **headers).status_code == 404
+
+
+def test_metrics_disabled(client, settings):
+    settings.PROFILING_METRICS_ENABLED = False
+
+    assert client.get('/metrics/', REMOTE_ADDR='127.0.0.1').status_code == 404
+
+
+def test_nested_measure_is_added_once(monkeypatch):
+    clock = iter((0, 1, 2, 3, 4, 5))
+    monkeypatch.setattr(profiling.time, 'perf_counter', lambda: next(clock))
+
+    with profiling.profile() as sample:
+        with profiling.measure('serializer_ms'):
+            with profiling.measure('serializer_ms'):
+                pass
+
+    # Outer block started at 1 s and ended at 2 s of the fake clock
+    assert sample.measurements['serializer_ms'] == 1000
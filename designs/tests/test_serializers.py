@@ -0,0 +1,35 @@
+import pytest
+from rest_framework import serializers
+
+from designs.api.serializers import (
+    CamelCaseSerializerMixin,
+    get_declared_thumbnail_fields,
+    get_instance_thumbnail_specs,
+)
+from designs.models import Design, Image, Link, Video
+from news.api import serializers as news_serializers  # noqa: F401 defines News serializer
+from news.models import News
+
+
+@pytest.mark.parametrize('model', [Design, Image, Video, Link, News])
+def test_declared_thumbnail_fields(model):
+    # Serializers of the model are indirect subclasses of `ModelSerializer`
+    assert get_declared_thumbnail_fields(model)
+
+
+def test_instance_thumbnail_specs(make_design):
+    design = make_design('tom-cat')
+
+    specs = get_instance_thumbnail_specs(design)
+
+    assert specs
+    assert {image for image, _geometry, _format in specs} == {design.image}
+
+
+class NoteSerializer(CamelCaseSerializerMixin, serializers.Serializer):
+    tiny_description = serializers.CharField()
+    meta_keywords = serializers.CharField(required=False)
+
+
+def test_camel_case_serializer_skips_missing_fields():
+    assert NoteSerializer({'tiny_description': 'fast'}).data == {'tinyDescription': 'fast'}
@@ -0,0 +1,60 @@
+import pytest
+
+from designs.models import Design, SimilarDesign
+from designs.similarity import similarity_index, update_similar_designs
+
+
+@pytest.fixture(autouse=True)
+def empty_index():
+    """Start every test as a new process."""
+    similarity_index.reset(())
+    yield
+    similarity_index.reset(())
+
+
+@pytest.fixture
+def designs(make_design, settings):
+    settings.SIMILAR_DESIGNS_COUNT = 3
+    return [
+        make_design('boat-{0}'.format(index), loa=3000 + index * 1000)
+        for index in range(20)
+    ]
+
+
+def test_update_similar_designs_rebuild(designs):
+    affected = update_similar_designs(rebuild=True)
+
+    assert affected == {design.pk for design in designs}
+    assert SimilarDesign.objects.filter(design=designs[0]).count() == 3
+
+
+def test_update_similar_designs_first_sync(designs):
+    update_similar_designs(rebuild=True)
+    stored_ids = set(SimilarDesign.objects.values_list('pk', flat=True))
+    # Loaded by another process
+    similarity_index.reset(())
+    Design.objects.filter(pk=designs[0].pk).update(loa=2000)
+
+    affected = update_similar_designs([designs[0].pk])
+
+    assert designs[0].pk in affected
+    assert len(affected) < len(designs)
+    rewritten_ids = stored_ids - set(SimilarDesign.objects.values_list('pk', flat=True))
+    assert set(
+        SimilarDesign.objects.filter(pk__in=rewritten_ids).values_list('design_id', flat=True),
+    ) <= affected
+
+
+@pytest.mark.django_db(transaction=True)
+def test_saved_design_updates_similar_designs_after_commit(designs):
+    update_similar_designs(rebuild=True)
+    design = designs[0]
+
+    design.loa = 20000
+    design.save()
+
+    # Nothing runs in background in tests, the update is done on commit
+    nearest = SimilarDesign.objects.filter(design=design).order_by('rank')
+    assert list(nearest.values_list('similar__slug', flat=True)) == [
+        'boat-17', 'boat-18', 'boat-16',
+    ]
@@ -0,0 +1,15 @@
+import pytest
+from sorl.thumbnail import get_thumbnail
+
+from designs.thumbnails import get_thumbnail_file, get_thumbnail_options
+
+
+@pytest.mark.parametrize('image_format', [None, 'WEBP'])
+def test_thumbnail_file_matches_sorl(db, test_image, image_format):
+    # Names are derived with private sorl methods, an upgrade changing them fails here
+    options = get_thumbnail_options(image_format)
+
+    thumbnail_file = get_thumbnail_file(test_image, '64x64', **options)
+
+    thumbnail = get_thumbnail(test_image, '64x64', **options)
+    assert (thumbnail_file.name, thumbnail_file.key) == (thumbnail.name, thumbnail.key)
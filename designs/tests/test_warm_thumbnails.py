@@ -0,0 +1,39 @@
+import io
+
+from designs.api.serializers import get_instance_thumbnail_specs
+from designs.management.commands.warm_thumbnails import Command
+from designs.models import Design
+
+
+class InlinePool(object):
+    """Process pool running tasks in the calling process."""
+
+    def map(self, func, iterable):
+        """Return results of the tasks."""
+        return [func(task) for task in iterable]
+
+
+def warm_designs():
+    command = Command(stdout=io.StringIO())
+    command.checkpoint_path = None
+    command.checkpoint = {}
+    command.thumbnails_count = 0
+    command.generated_count = 0
+    command.started_at = 0
+    command.warm_model(Design, InlinePool(), workers=2, batch_size=1)
+    return command
+
+
+def test_warm_thumbnails_counts_thumbnails(make_design):
+    design = make_design('tom-cat')
+    make_design('jack-cat')
+    # Both designs share the image
+    thumbnails_count = len(set(get_instance_thumbnail_specs(design)))
+
+    first_run = warm_designs()
+    second_run = warm_designs()
+
+    assert (first_run.thumbnails_count, first_run.generated_count) == (
+        thumbnails_count, thumbnails_count,
+    )
+    assert (second_run.thumbnails_count, second_run.generated_count) == (thumbnails_count, 0)
@@ -0,0 +1,165 @@
+"""Thumbnail utils built on top of sorl-thumbnail."""
+
+import hashlib
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.db import connections, transaction
+from sorl.thumbnail import default, get_thumbnail
+from sorl.thumbnail.conf import defaults as default_settings
+from sorl.thumbnail.conf import settings
+from sorl.thumbnail.images import ImageFile, deserialize_image_file
+from sorl.thumbnail.kvstores.base import add_prefix
+
+from designs.profiling import record
+
+logger = logging.getLogger(__name__)
+
+
+def get_thumbnail_key(image, geometry_string, image_format=None):
+    """
+    Return key identifying thumbnail in results of `get_thumbnails`.
+
+    >>> get_thumbnail_key('design/boat.jpg', '64x64', 'WEBP')
+    ('design/boat.jpg', '64x64', 'WEBP')
+    """
+    return (getattr(image, 'name', image), geometry_string, image_format)
+
+
+def get_thumbnail_options(image_format=None):
+    """Return options for `get_thumbnail` call."""
+    return {'format': image_format} if image_format else {}
+
+
+def get_thumbnail_file(image, geometry_string, **options):
+    """
+    Return thumbnail `ImageFile` without touching KV store or storage.
+
+    Options are completed the same way `ThumbnailBackend.get_thumbnail` does it,
+    so the resulting name (and KV store key) match the ones sorl will use.
+    """
+    backend = default.backend
+    source = ImageFile(image)
+    if settings.THUMBNAIL_PRESERVE_FORMAT:
+        options.setdefault('format', backend._get_format(source))  # noqa: WPS437
+    for option, option_value in backend.default_options.items():
+        options.setdefault(option, option_value)
+    for option, attr in backend.extra_options:
+        option_value = getattr(settings, attr)
+        if option_value != getattr(default_settings, attr):
+            options.setdefault(option, option_value)
+
+    name = backend._get_thumbnail_filename(source, geometry_string, options)  # noqa: WPS437
+    return ImageFile(name, default.storage)
+
+
+def get_thumbnail_settings_version():
+    """Return short hash of settings thumbnail names depend on, e.g. `THUMBNAIL_QUALITY`."""
+    backend = default.backend
+    thumbnail_settings = [
+        backend.default_options,
+        [getattr(settings, attr) for _option, attr in backend.extra_options],
+        settings.THUMBNAIL_PRESERVE_FORMAT,
+    ]
+    settings_data = json.dumps(thumbnail_settings, sort_keys=True, default=str)
+    return hashlib.md5(settings_data.encode()).hexdigest()[:8]  # noqa: S303
+
+
+def get_cached_thumbnails(thumbnail_files):
+    """
+    Fetch thumbnails from KV store cache with a single multi-get.
+
+    Takes dict `{key: ImageFile}` and returns dict `{key: ImageFile}` for cache hits.
+    """
+    kv_cache = getattr(default.kvstore, 'cache', None)
+    if kv_cache is None:
+        # KV store is not backed by django cache, let `get_thumbnail` handle it
+        return {}
+
+    cache_keys = {
+        add_prefix(thumbnail.key): key for key, thumbnail in thumbnail_files.items()
+    }
+    record('thumbnail_lookups')
+    return {
+        cache_keys[cache_key]: deserialize_image_file(cached_value)
+        for cache_key, cached_value in kv_cache.get_many(list(cache_keys)).items()
+        # cached_db KV store caches misses with a marker class
+        if isinstance(cached_value, str)
+    }
+
+
+def get_missing_thumbnail_specs(specs):
+    """Return specs of thumbnails absent in KV store cache, images are replaced by names."""
+    thumbnail_files = {
+        get_thumbnail_key(*spec): get_thumbnail_file(
+            spec[0],
+            spec[1],
+            **get_thumbnail_options(spec[2]),
+        )
+        for spec in specs
+    }
+    cached = get_cached_thumbnails(thumbnail_files)
+    return [key for key in thumbnail_files if key not in cached]
+
+
+def get_thumbnails(specs):
+    """
+    Resolve many thumbnails at once.
+
+    `specs` is an iterable of `(image, geometry_string, image_format)` triples.
+    All thumbnails are looked up with a single multi-get against the KV store cache,
+    only misses fall back to `get_thumbnail` (and generation).
+    Return dict of thumbnails keyed by `get_thumbnail_key`.
+    """
+    images = {}
+    thumbnail_files = {}
+    for image, geometry_string, image_format in specs:
+        key = get_thumbnail_key(image, geometry_string, image_format)
+        if key not in images:
+            images[key] = image
+            thumbnail_files[key] = get_thumbnail_file(
+                image,
+                geometry_string,
+                **get_thumbnail_options(image_format),
+            )
+
+    thumbnails = get_cached_thumbnails(thumbnail_files)
+    for key, image in images.items():
+        if key not in thumbnails:
+            _name, geometry_string, image_format = key
+            record('thumbnail_lookups')
+            thumbnails[key] = get_thumbnail(
+                image,
+                geometry_string,
+                **get_thumbnail_options(image_format),
+            )
+    return thumbnails
+
+
+@lru_cache(maxsize=None)
+def get_executor():
+    """Return worker pool for thumbnail pre-generation."""
+    return ThreadPoolExecutor(
+        max_workers=settings.THUMBNAIL_PREGENERATE_WORKERS,
+        thread_name_prefix='thumbnails',
+    )
+
+
+def generate_thumbnails(specs):
+    """Generate thumbnails, it is a worker pool (threads or processes) task."""
+    try:
+        get_thumbnails(specs)
+    except Exception:
+        logger.exception('Thumbnails pre-generation failed')
+    finally:
+        # Workers have their own DB connections
+        connections.close_all()
+
+
+def pregenerate_thumbnails(specs):
+    """Schedule thumbnails generation in the worker pool after transaction commit."""
+    if not specs or not settings.THUMBNAIL_PREGENERATE_WORKERS:
+        return
+    transaction.on_commit(lambda: get_executor().submit(generate_thumbnails, specs))
@@ -0,0 +1,219 @@
+"""
+Bulk upserts of cleaned import rows, see `designs.importing`.
+
+A batch of rows is saved in a transaction with a few bulk queries per model.
+Only changed fields are written, given tags, kinds, hull constructions and
+media lists replace the current ones, media items are matched by `order`.
+Bulk queries bypass model signals, so search vectors, design cards and API
+cache of changed designs are updated by `save_rows` itself.
+"""
+
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from designs.cards import delete_design_cards
+from designs.importing import MEDIA_MODELS, RELATED_FIELDS
+from designs.models import Design, Designer, Tag
+from designs.search import update_search_vectors
+from designs.signals import invalidate_designs
+
+
+def set_changed_values(instance, field_values):
+    """Set the field values of the instance, return names of the changed fields."""
+    changed_fields = []
+    for name, field_value in field_values.items():
+        if getattr(instance, name) != field_value:
+            setattr(instance, name, field_value)
+            changed_fields.append(name)
+    return changed_fields
+
+
+def bulk_update_changed(model, changes):
+    """
+    Update `(instance, changed fields)` pairs, a query per set of changed fields.
+
+    Cost of `bulk_update()` grows with number of fields of every object, so
+    unchanged fields are not written.
+    """
+    instances = defaultdict(list)
+    for instance, changed_fields in changes:
+        instances[tuple(sorted(changed_fields))].append(instance)
+    for fields_group, grouped_instances in instances.items():
+        model.objects.bulk_update(grouped_instances, fields_group)
+
+
+def get_by_slug(model, names):
+    """Return `{slug: object}` of the model, missing objects are created with the names."""
+    objects = model.objects.in_bulk(list(names), field_name='slug')
+    missing = [
+        model(slug=slug, name=name)
+        for slug, name in names.items()
+        if slug not in objects
+    ]
+    if missing:
+        model.objects.bulk_create(missing, ignore_conflicts=True)
+        objects = model.objects.in_bulk(list(names), field_name='slug')
+    return objects
+
+
+def save_designers(rows):
+    """Return `{slug: designer}` of the rows and pks of designs of renamed designers."""
+    names = {row['designer']: row['designer_name'] or row['designer'] for row in rows}
+    designers = get_by_slug(Designer, names)
+    renamed = []
+    for row in rows:
+        designer = designers[row['designer']]
+        if set_changed_values(designer, {'name': row['designer_name'] or designer.name}):
+            renamed.append(designer)
+    Designer.objects.bulk_update(renamed, ['name'])
+    return designers, set(
+        Design.objects.filter(designer__in=renamed).values_list('pk', flat=True),
+    )
+
+
+def set_new_design_ids(new_designs):
+    """Set primary keys of created designs, not every database returns them on insert."""
+    if all(design.pk is not None for design in new_designs):
+        return
+    design_ids = dict(
+        Design.objects.filter(
+            slug__in=[design.slug for design in new_designs],
+        ).values_list('slug', 'pk'),
+    )
+    for new_design in new_designs:
+        new_design.pk = design_ids[new_design.slug]
+
+
+def save_designs(rows, designers, changed_ids):
+    """Return `{slug: design}` of the rows, create new designs and update changed ones."""
+    designs = Design.objects.in_bulk([row['slug'] for row in rows], field_name='slug')
+    new_designs = []
+    changes = []
+    now = timezone.now()
+    for row in rows:
+        design = designs.get(row['slug'])
+        if design is None:
+            design = Design(slug=row['slug'])
+            new_designs.append(design)
+            designs[design.slug] = design
+        changed_fields = set_changed_values(design, {
+            'designer_id': designers[row['designer']].pk,
+            'propulsion_id': row['propulsion'].pk,
+            **row['fields'],
+        })
+        if changed_fields and design.pk is not None:
+            design.last_update = now
+            changes.append((design, changed_fields + ['last_update']))
+            changed_ids.add(design.pk)
+    bulk_update_changed(Design, changes)
+    Design.objects.bulk_create(new_designs)
+    set_new_design_ids(new_designs)
+    changed_ids.update(new_design.pk for new_design in new_designs)
+    return designs
+
+
+def replace_related_ids(field, related_ids):
+    """Replace related objects of the many-to-many field, return pks of changed designs."""
+    through = field.remote_field.through
+    design_column = field.m2m_column_name()
+    current_ids = defaultdict(set)
+    for current_design_id, current_related_id in through.objects.filter(
+        **{'{0}__in'.format(design_column): list(related_ids)},
+    ).values_list(design_column, field.m2m_reverse_name()):
+        current_ids[current_design_id].add(current_related_id)
+    changed = [
+        design_id
+        for design_id, design_related_ids in related_ids.items()
+        if design_related_ids != current_ids[design_id]
+    ]
+    through.objects.filter(**{'{0}__in'.format(design_column): changed}).delete()
+    through.objects.bulk_create([
+        through(**{design_column: changed_id, field.m2m_reverse_name(): related_id})
+        for changed_id in changed
+        for related_id in related_ids[changed_id]
+    ])
+    return changed
+
+
+def save_relations(rows, designs, related_objects, changed_ids):
+    """Replace changed tags, kinds and hull constructions of the rows given them."""
+    tag_slugs = {slug for row in rows for slug in row['tags'] or ()}
+    related_objects = {
+        'tags': get_by_slug(Tag, {slug: slug for slug in tag_slugs}),
+        **related_objects,
+    }
+    for name in RELATED_FIELDS:
+        field_objects = related_objects[name]
+        related_ids = {
+            designs[row['slug']].pk: {field_objects[slug].pk for slug in row[name]}
+            for row in rows
+            if row[name] is not None
+        }
+        changed_ids.update(replace_related_ids(Design._meta.get_field(name), related_ids))
+
+
+def match_media_items(model, design_id, cleaned_items, current_items):
+    """
+    Return new items and `(item, changed fields)` pairs of the design's media.
+
+    Current items matched by order are popped from `current_items`.
+    """
+    new_items = []
+    changes = []
+    for cleaned in cleaned_items:
+        item = current_items.pop((design_id, cleaned['order']), None)
+        if item is None:
+            new_items.append(model(design_id=design_id, **cleaned))
+            continue
+        changed_fields = set_changed_values(item, cleaned)
+        if changed_fields:
+            changes.append((item, changed_fields))
+    return new_items, changes
+
+
+def save_model_media(model, media_rows, changed_ids):
+    """Upsert `(design pk, cleaned items)` of the model by order, delete missing items."""
+    current_items = {
+        (item.design_id, item.order): item
+        for item in model.objects.filter(design_id__in=[row[0] for row in media_rows])
+    }
+    new_items = []
+    changes = []
+    for design_id, cleaned_items in media_rows:
+        design_new, design_changes = match_media_items(
+            model, design_id, cleaned_items, current_items,
+        )
+        if design_new or design_changes:
+            new_items.extend(design_new)
+            changes.extend(design_changes)
+            changed_ids.add(design_id)
+    changed_ids.update(item.design_id for item in current_items.values())
+    model.objects.filter(pk__in=[item.pk for item in current_items.values()]).delete()
+    bulk_update_changed(model, changes)
+    model.objects.bulk_create(new_items)
+
+
+def save_media(rows, designs, changed_ids):
+    """Upsert media items of the rows by order, delete items missing in the rows."""
+    for media, (model, _) in MEDIA_MODELS.items():
+        save_model_media(
+            model,
+            [(designs[row['slug']].pk, row[media]) for row in rows if row[media] is not None],
+            changed_ids,
+        )
+
+
+def save_rows(rows, related_objects):
+    """Save cleaned rows in a transaction, return pks of changed designs."""
+    with transaction.atomic():
+        designers, changed_ids = save_designers(rows)
+        designs = save_designs(rows, designers, changed_ids)
+        save_relations(rows, designs, related_objects, changed_ids)
+        save_media(rows, designs, changed_ids)
+        update_search_vectors(changed_ids)
+        # Stale cards are rendered again on the first request
+        delete_design_cards(Design.objects.filter(pk__in=changed_ids))
+    invalidate_designs(Design.objects.filter(pk__in=changed_ids))
+    return changed_ids
@@ -0,0 +1,12 @@
+"""Pagination for news API."""
+
+from rest_framework.pagination import CursorPagination
+
+
+class NewsCursorPagination(CursorPagination):
+    """Keyset pagination over the indexed creation time, the newest news first."""
+
+    ordering = '-created_at'
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 50
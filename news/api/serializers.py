@@ -0,0 +1,24 @@
+"""Serializers for news app."""
+
+from rest_framework import serializers
+
+from designs.api.serializers import (
+    BulkThumbnailListSerializer,
+    CamelCaseModelSerializer,
+    SerializerThumbnailImageField,
+)
+from news.models import News
+
+
+class NewsSerializer(CamelCaseModelSerializer):
+    image = SerializerThumbnailImageField(size=(400, 300))
+    designs = serializers.SerializerMethodField()
+
+    class Meta:
+        model = News
+        list_serializer_class = BulkThumbnailListSerializer
+        fields = ['slug', 'title', 'image', 'content', 'url', 'created_at', 'designs']
+
+    def get_designs(self, news):
+        """Return cards of mentioned designs fetched for the whole page."""
+        return self.context['design_cards'].get(news.pk, [])
@@ -0,0 +1,8 @@
+"""News API URL Configuration."""
+from django.urls import path
+
+from news.api import views
+
+urlpatterns = [
+    path('news/', views.NewsListView.as_view()),
+]
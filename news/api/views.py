@@ -0,0 +1,33 @@
+"""API views for news app."""
+
+from rest_framework.generics import ListAPIView
+
+from designs.api.cache import (
+    CATALOGUE_SCOPE,
+    NEWS_SCOPE,
+    CachedResponseMixin,
+    ConditionalGetMixin,
+)
+from news.api.pagination import NewsCursorPagination
+from news.api.serializers import NewsSerializer
+from news.selectors import get_enabled_news, get_mentioned_design_cards
+
+
+class NewsListView(ConditionalGetMixin, CachedResponseMixin, ListAPIView):
+    queryset = get_enabled_news()
+    serializer_class = NewsSerializer
+    pagination_class = NewsCursorPagination
+    # Cards of mentioned designs depend on the catalogue
+    cache_scopes = (NEWS_SCOPE, CATALOGUE_SCOPE)
+
+    def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        serializer = self.get_serializer(
+            page,
+            many=True,
+            context={
+                **self.get_serializer_context(),
+                'design_cards': get_mentioned_design_cards(page),
+            },
+        )
+        return self.get_paginated_response(serializer.data)
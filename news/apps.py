@@ -7,3 +7,7 @@ class NewsConfig(AppConfig):
     """Config for news application."""
 
     name = 'news'
+
+    def ready(self):
+        """Connect signal handlers."""
+        import news.signals  # noqa: F401, WPS433
@@ -0,0 +1,31 @@
+"""Selectors and getters for news app."""
+
+from collections import defaultdict
+
+from designs.cards import get_cards_by_id
+from designs.selectors import get_enabled_designs
+from news.models import News
+
+
+def get_enabled_news():
+    """Return published news, the newest first."""
+    return News.objects.filter(enabled=True).order_by('-created_at')
+
+
+def get_mentioned_design_cards(news_list, kind='card'):
+    """
+    Return `{news pk: cards of enabled mentioned designs}` of the news.
+
+    Mentions of all the news are read by a single query, cards of all
+    mentioned designs are fetched (or rendered) in bulk.
+    """
+    mentions = News.designs.through.objects.filter(
+        news__in=[news.pk for news in news_list],
+    ).order_by('pk').values_list('news_id', 'design_id')
+    design_ids = {design_id for _, design_id in mentions}
+    cards = get_cards_by_id(get_enabled_designs(pk__in=design_ids), kind) if design_ids else {}
+    design_cards = defaultdict(list)
+    for news_id, design_id in mentions:
+        if design_id in cards:
+            design_cards[news_id].append(cards[design_id])
+    return design_cards
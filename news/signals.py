@@ -0,0 +1,15 @@
+"""Signal handlers for news application."""
+
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+from designs.api.cache import NEWS_SCOPE, invalidate
+from news.models import News
+
+
+@receiver(post_save, sender=News)
+@receiver(pre_delete, sender=News)
+@receiver(m2m_changed, sender=News.designs.through)
+def invalidate_news(sender, **kwargs):
+    """Drop cached news responses."""
+    invalidate(NEWS_SCOPE)
@@ -0,0 +1 @@
+from designs.tests.conftest import local_services, test_image  # noqa: F401 shared fixtures
@@ -0,0 +1,14 @@
+from news.models import News
+
+
+def test_news_list_etag_changes_with_edits(client, db, test_image):
+    news = News.objects.create(title='Launch', slug='launch', image=test_image, content='Hi')
+    response = client.get('/api/news/')
+    etag = response['ETag']
+
+    # Edits don't touch creation time, so no Last-Modified to rely on
+    assert 'Last-Modified' not in response
+    assert client.get('/api/news/', HTTP_IF_NONE_MATCH=etag).status_code == 304
+    news.title = 'Launch day'
+    news.save()
+    assert client.get('/api/news/', HTTP_IF_NONE_MATCH=etag).status_code == 200